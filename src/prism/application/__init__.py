@@ -1,22 +1,24 @@
 # Application: use cases.
 
 from .search import search_api
-from .index_queries import get_class, get_method, list_classes, list_packages, get_index_stats, get_context_list
+from .index_queries import get_class, get_classes, get_method, list_classes, list_packages, get_index_stats, get_context_list
 from .read_source import read_source
 from .hierarchy import get_hierarchy
 from .usages import find_usages
 from .event_service import list_events
 from .hierarchy_service import find_implementations
-from .call_flow_service import get_call_flow
+from .call_flow_service import get_call_flow, get_call_graph
 
 __all__ = [
     "search_api",
     "get_class",
+    "get_classes",
     "get_method",
     "list_classes",
     "list_packages",
     "list_events",
     "get_call_flow",
+    "get_call_graph",
     "get_index_stats",
     "get_context_list",
     "read_source",
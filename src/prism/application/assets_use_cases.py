@@ -1,11 +1,17 @@
 # src/prism/application/assets_use_cases.py
-import zipfile
+import sqlite3
 from pathlib import Path
 from typing import Callable, List, Optional
 from ..infrastructure.assets_indexer import AssetIndexer
+from ..infrastructure import asset_links, zip_cache
+from ..infrastructure.db import ASSET_REFS_MAX_DEPTH
 from ..ports.assets_repository import AssetsRepository
 from ..domain.asset import Asset
 
+#_ prism_asset_refs directions: what an asset uses / what uses it
+ASSET_REF_DIRECTIONS = ("forward", "reverse")
+
+
 class AssetsUseCases:
     """Orchestrates asset-related operations."""
 
@@ -17,11 +23,27 @@ class AssetsUseCases:
         db_path: Path,
         assets_zip_path: Path,
         version: str,
-        progress_callback: Callable[[str, int, int], None] | None = None
-    ) -> None:
-        """Runs the indexer process."""
+        progress_callback: Callable[[str, int, int], None] | None = None,
+        jobs: int | None = None,
+        rebuild: bool = False,
+        api_db_path: Path | None = None,
+        sources_dir: Path | None = None
+    ) -> dict[str, int] | None:
+        """
+        Runs the indexer process (jobs: worker processes; default CPU count, 1 = sequential).
+        Only ZIP entries added, changed or removed since the last run are processed unless rebuild is True.
+        With api_db_path (and the decompiled sources_dir), also links asset categories to the API classes
+        that load them (see asset_links).
+        Returns {"entries", "added", "changed", "removed", "code_links"} or None if Assets.zip does not exist.
+        """
         indexer = AssetIndexer(db_path, assets_zip_path, version)
-        indexer.run(progress_callback)
+        stats = indexer.run(progress_callback, jobs=jobs, rebuild=rebuild)
+        if stats is not None:
+            stats["code_links"] = (
+                asset_links.build_asset_code_links(db_path, api_db_path, sources_dir, AssetIndexer.CATEGORY_MAP)
+                if api_db_path else 0
+            )
+        return stats
 
     def search_assets(
         self,
@@ -32,26 +54,154 @@ class AssetsUseCases:
         """Searches assets in the database."""
         return self.repository.search_assets(db_path, query, limit)
 
+    def search_assets_faceted(
+        self,
+        db_path: Path,
+        query: str,
+        limit: int = 50,
+        t: Callable | None = None
+    ) -> tuple[dict | None, dict | None]:
+        """
+        Searches assets with filters and facets, e.g. 'stone cat:Block ext:png w>=64 size<100k'.
+        Returns ({"text", "filters", "results": [Asset], "total", "facets": {"category", "extension"}}, None)
+        or (None, error_dict); t (i18n) translates the hint of an FTS5 syntax error.
+        """
+        try:
+            return (self.repository.search_assets_faceted(db_path, query, limit), None)
+        except sqlite3.OperationalError as e:
+            err_msg = str(e).lower()
+            if "fts5" in err_msg or "syntax" in err_msg:
+                hint = t("cli.query.fts5_help") if t else "Use a single word or quoted phrase. Multiple terms: term1 AND term2."
+                return (None, {"error": "fts5_syntax", "message": str(e), "hint": hint})
+            return (None, {"error": "db", "message": str(e)})
+
     def get_asset_info(self, db_path: Path, path: str) -> Optional[Asset]:
         """Gets detailed info about an asset."""
         return self.repository.get_asset_by_path(db_path, path)
 
+    def get_asset_references(
+        self,
+        db_path: Path,
+        asset_path: str,
+        direction: str = "forward",
+        depth: int = 1,
+        limit: int = 100
+    ) -> tuple[dict | None, dict | None]:
+        """
+        Forward (assets this one references) or reverse (assets referencing this one) dependencies,
+        transitively up to depth hops. Returns (data, None) or (None, error_dict).
+        """
+        if direction not in ASSET_REF_DIRECTIONS:
+            return (None, {"error": "invalid_direction", "message": f"direction must be one of: {', '.join(ASSET_REF_DIRECTIONS)}."})
+        depth = max(1, min(depth, ASSET_REFS_MAX_DEPTH))
+        found = self.repository.get_asset_references(
+            db_path, asset_path.replace('\\', '/'), reverse=direction == "reverse", depth=depth, limit=max(1, min(limit, 1000))
+        )
+        if found is None:
+            return (None, {"error": "asset_not_found", "message": f"Asset {asset_path} is not indexed."})
+        if found["refs"] is None:
+            return (None, {"error": "no_ref_index", "message": "The assets index has no reference graph. Re-run prism ctx assets."})
+        return ({
+            "path": asset_path,
+            "direction": direction,
+            "depth": depth,
+            "count": len(found["refs"]),
+            "results": [
+                {k: r[k] for k in ("path", "category", "internal_id", "extension", "depth", "via")}
+                for r in found["refs"]
+            ],
+            "unresolved": found["unresolved"],
+        }, None)
+
+    def get_code_links(
+        self,
+        db_path: Path,
+        api_db_path: Path | None,
+        category: str | None = None,
+        class_name: str | None = None,
+        asset: str | None = None
+    ) -> tuple[dict | None, dict | None]:
+        """
+        Both sides of the asset <-> code linkage in one call: by category (name or folder, e.g. Item or
+        Item/Items), by class (simple name or FQCN) or by asset (path or internal id).
+        Returns (data, None) or (None, error_dict).
+        """
+        if not (category or class_name or asset):
+            return (None, {"error": "missing_argument", "message": "Provide category, class_name or asset."})
+        package = None
+        if class_name and "." in class_name:
+            package, class_name = class_name.rsplit(".", 1)
+        found = self.repository.get_asset_code_links(
+            db_path, api_db_path, category=category, package=package, class_name=class_name,
+            asset=asset.replace('\\', '/') if asset else None
+        )
+        if found is None:
+            return (None, {"error": "no_link_index", "message": "The assets index has no code links. Re-run prism ctx assets after indexing the code."})
+        links = found["links"]
+        classes = {}
+        for link in links:
+            fqcn = f"{link['package']}.{link['class_name']}"
+            entry = classes.setdefault(fqcn, {
+                "package": link["package"],
+                "class_name": link["class_name"],
+                "kind": link.get("kind"),
+                "file_path": link.get("file_path"),
+                "categories": [],
+            })
+            entry["categories"].append({"category": link["category"], "evidence": link["evidence"]})
+        return ({
+            "count": len(links),
+            "classes": list(classes.values()),
+            "categories": [{"category": c, **info} for c, info in found["categories"].items()],
+        }, None)
+
     def inspect_asset_file(
         self,
         assets_zip_path: Path,
         asset_path: str
     ) -> bytes | None:
-        """Extracts the bytes of a specific file from the ZIP without extracting everything."""
-        if not assets_zip_path.exists():
+        """
+        Extracts the bytes of a specific file from the ZIP without extracting everything.
+        The archive handle and its central directory are cached per process (see zip_cache).
+        """
+        try:
+            return zip_cache.read_entry(assets_zip_path, asset_path)
+        except Exception:
+            return None
+
+    def read_asset_window(
+        self,
+        assets_zip_path: Path,
+        asset_path: str,
+        offset: int,
+        length: int
+    ) -> tuple[bytes, int] | None:
+        """
+        Returns (bytes, total_size) for length bytes of an asset starting at offset, inflating only the
+        requested window of the ZIP member. None if the archive or asset is missing.
+        """
+        try:
+            found = zip_cache.read_entry_range(assets_zip_path, asset_path, offset, length)
+        except Exception:
+            return None
+        if found is None:
             return None
-        
+        data, info = found
+        return (data, info.file_size)
+
+    def get_asset_entry(self, assets_zip_path: Path, asset_path: str) -> dict | None:
+        """ZIP central directory facts of an asset (nothing is inflated). None if the archive or asset is missing."""
         try:
-            with zipfile.ZipFile(assets_zip_path, 'r') as z:
-                #_ zipfile.ZipFile.open expects a ZIP-style path (forward slashes)
-                zp = asset_path.replace('\\', '/')
-                if zp in z.namelist():
-                    with z.open(zp) as f:
-                        return f.read()
+            found = zip_cache.get_entry(assets_zip_path, asset_path)
         except Exception:
-            pass
-        return None
+            return None
+        if found is None:
+            return None
+        _, info = found
+        return {
+            "size_bytes": info.file_size,
+            "compressed_size_bytes": info.compress_size,
+            "crc32": f"{info.CRC:08x}",
+            "compression": zip_cache.COMPRESSION_NAMES.get(info.compress_type, str(info.compress_type)),
+            "modified": "%04d-%02d-%02dT%02d:%02d:%02d" % info.date_time,
+        }
@@ -1,7 +1,7 @@
 # src/prism/application/call_flow_service.py
 from pathlib import Path
 from typing import TYPE_CHECKING
-from collections import defaultdict
+from collections import defaultdict, deque
 
 if TYPE_CHECKING:
     from ..ports import ConfigProvider, IndexRepository
@@ -27,7 +27,7 @@ def get_call_flow(
     version = normalize_version(version)
     
     #_ Search for usages in source code
-    usages, err = find_usages(config_provider, root, version, f"{target_class}.{method_name}", limit=limit)
+    usages, err = find_usages(config_provider, index_repository, root, version, f"{target_class}.{method_name}", limit=limit)
     if err:
         return None, err
     
@@ -69,3 +69,161 @@ def get_call_flow(
         "total_usages": len(usages),
         "flow": results
     }, None
+
+
+#_ Graph walks: hop limit and accepted directions
+CALL_GRAPH_MAX_DEPTH = 5
+CALL_GRAPH_DIRECTIONS = ("callers", "callees")
+#_ Call sites read per expanded method (callers); more than this marks the graph truncated
+CALL_GRAPH_CALLER_EDGES = 200
+
+
+def get_call_graph(
+    config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
+    root: Path | None,
+    version: str,
+    target_class: str,
+    method_name: str,
+    direction: str = "callers",
+    depth: int = 1,
+    limit: int = 100,
+) -> tuple[dict | None, dict | None]:
+    """
+    Walks the call edges recorded at index time from target_class.method_name (simple name or FQCN).
+    direction: "callers" (who calls it) or "callees" (what it calls); depth: hops (1..CALL_GRAPH_MAX_DEPTH).
+    A node already on its own path is returned with "cycle": true, one already expanded elsewhere with
+    "seen": true; neither is expanded again. limit caps the total number of nodes, CALL_GRAPH_CALLER_EDGES
+    the call sites read per method; "truncated" is set when either cut the result.
+    """
+    from ..domain.constants import normalize_version
+
+    root = root or config_provider.get_project_root()
+    version = normalize_version(version)
+    if direction not in CALL_GRAPH_DIRECTIONS:
+        return None, {"error": "invalid_mode", "message": f"mode must be one of: usages, {', '.join(CALL_GRAPH_DIRECTIONS)}"}
+    db_path = config_provider.get_db_path(root, version)
+    if not db_path.is_file():
+        return None, {"error": "no_db", "message": f"Database for version {version} does not exist."}
+    depth = max(1, min(int(depth), CALL_GRAPH_MAX_DEPTH))
+
+    package_hint, _, simple_class = target_class.rpartition(".")
+    start = index_repository.resolve_method_class(db_path, simple_class, method_name, package_hint or None)
+    if start is None:
+        error = {"error": "not_found", "message": f"Class {target_class} not found."}
+        suggestions = _symbol_table(index_repository, db_path).suggest_classes(package_hint, simple_class)
+        if suggestions:
+            error["suggestions"] = suggestions
+        return None, error
+    #_ The class exists but may not declare the method (e.g. a typo): closest member names instead of an empty graph
+    declared = index_repository.get_method(db_path, start["package"], start["class_name"], method_name)
+    if not declared or not declared["methods"]:
+        error = {"error": "not_found", "message": f"Method {start['package']}.{start['class_name']}.{method_name} not found."}
+        suggestions = _symbol_table(index_repository, db_path).suggest_members(start["package"], start["class_name"], method_name)
+        if suggestions:
+            error["suggestions"] = suggestions
+        return None, error
+    start_key = (start["package"], start["class_name"], method_name)
+    if index_repository.get_callees(db_path, *start_key) is None:
+        return None, {"error": "no_call_graph", "message": "Index has no call graph. Re-index with: prism ctx db --rebuild"}
+
+    #_ Breadth-first, so a method is expanded at its shallowest occurrence
+    total_nodes = 0
+    truncated = False
+    seen: set[tuple[str, str, str]] = {start_key}
+    graph: list[dict] = []
+    queue = deque([(graph, start_key, frozenset((start_key,)), 1)])
+    clipped = False
+    while queue and not truncated:
+        out, key, path, level = queue.popleft()
+        if direction == "callers":
+            children, cut = _caller_nodes(index_repository, db_path, key)
+            clipped = clipped or cut
+        else:
+            children = _callee_nodes(index_repository, db_path, key)
+        for child, child_key in children:
+            if total_nodes >= limit:
+                truncated = True
+                break
+            total_nodes += 1
+            out.append(child)
+            if child_key is None:
+                continue
+            if child_key in path:
+                child["cycle"] = True
+            elif child_key in seen:
+                child["seen"] = True
+            else:
+                seen.add(child_key)
+                if level < depth:
+                    child["children"] = []
+                    queue.append((child["children"], child_key, path | {child_key}, level + 1))
+
+    return {
+        "version": version,
+        "target": f"{start['package']}.{start['class_name']}.{method_name}",
+        "mode": direction,
+        "depth": depth,
+        "total_nodes": total_nodes,
+        "truncated": truncated or clipped,
+        direction: graph,
+    }, None
+
+
+def _symbol_table(index_repository: "IndexRepository", db_path: Path):
+    """Fuzzy symbol table of the index at db_path, for "did you mean" suggestions (see symbol_lookup)."""
+    from .symbol_lookup import get_symbol_table
+
+    return get_symbol_table(
+        str(db_path),
+        index_repository.get_generation(db_path),
+        lambda: index_repository.get_symbol_classes(db_path),
+        lambda: index_repository.get_symbol_members(db_path),
+    )
+
+
+def _caller_nodes(
+    index_repository: "IndexRepository", db_path: Path, key: tuple[str, str, str]
+) -> tuple[list[tuple[dict, tuple | None]], bool]:
+    """
+    Callers of key, one node per calling method (its call lines grouped), and whether key has more than
+    CALL_GRAPH_CALLER_EDGES call sites (the rest are left out).
+    """
+    _, class_name, method_name = key
+    nodes: dict[tuple[str, str, str], dict] = {}
+    edges = index_repository.get_callers(db_path, class_name, method_name, limit=CALL_GRAPH_CALLER_EDGES + 1) or []
+    for edge in edges[:CALL_GRAPH_CALLER_EDGES]:
+        caller_key = (edge["package"], edge["class_name"], edge["method"])
+        node = nodes.get(caller_key)
+        if node is None:
+            node = nodes[caller_key] = {
+                "package": edge["package"],
+                "class_name": edge["class_name"],
+                "method": edge["method"],
+                "file_path": edge["file_path"],
+                "lines": [],
+            }
+        node["lines"].append(edge["line"])
+    return ([(node, caller_key) for caller_key, node in nodes.items()], len(edges) > CALL_GRAPH_CALLER_EDGES)
+
+
+def _callee_nodes(index_repository: "IndexRepository", db_path: Path, key: tuple[str, str, str]) -> list[tuple[dict, tuple | None]]:
+    """Methods called by key, one node per (callee, receiver); unresolved receivers are leaves."""
+    package, _, _ = key
+    nodes: dict[tuple[str, str | None], tuple[dict, tuple | None]] = {}
+    for edge in index_repository.get_callees(db_path, *key) or []:
+        group = (edge["callee"], edge["receiver_type"])
+        if group in nodes:
+            nodes[group][0]["lines"].append(edge["line"])
+            continue
+        target = index_repository.resolve_method_class(db_path, edge["receiver_type"], edge["callee"], package)
+        node = {
+            "package": target["package"] if target else None,
+            "class_name": target["class_name"] if target else edge["receiver_type"],
+            "method": edge["callee"],
+            "lines": [edge["line"]],
+        }
+        if target:
+            node["file_path"] = target["file_path"]
+        nodes[group] = (node, (target["package"], target["class_name"], edge["callee"]) if target else None)
+    return list(nodes.values())
@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import Any, TYPE_CHECKING
 from ..infrastructure import db
+from .result_cache import cached_call
+from .symbol_lookup import get_symbol_table
 
 if TYPE_CHECKING:
     from ..ports import ConfigProvider
@@ -8,62 +10,71 @@ if TYPE_CHECKING:
 def get_hierarchy(config_provider: "ConfigProvider", version: str, package: str, class_name: str, root: Path | None = None) -> dict[str, Any]:
     """
     Returns the hierarchy of a class: parents and implemented interfaces.
+    Results are cached per index generation (see result_cache).
     """
+    from ..domain.constants import normalize_version
+
     root = root or config_provider.get_project_root()
+    version = normalize_version(version)
+    package, class_name = package.strip(), class_name.strip()
     db_path = config_provider.get_db_path(root, version)
+    if not db_path.is_file():
+        return {"error": "no_db", "message": f"Database for version {version} does not exist."}
     
-    with db.connection(db_path) as conn:
-        root_class = db.get_class_and_methods(conn, package, class_name)
+    with db.read_connection(db_path) as conn:
+        generation = db.get_generation(conn)
+    return cached_call(
+        "get_hierarchy",
+        version,
+        (package, class_name),
+        generation,
+        lambda: _build_hierarchy(db_path, package, class_name, generation),
+    )
+
+def _build_hierarchy(db_path: Path, package: str, class_name: str, generation: str | None = None) -> dict[str, Any]:
+    """
+    Parent chain from the type_closure table (one query); "supertypes" lists every resolved ancestor
+    (classes and interfaces, transitively) with its depth. A DB built before the closure table must be re-indexed.
+    An unknown class gets "suggestions" from the fuzzy symbol table.
+    """
+    with db.read_connection(db_path) as conn:
+        root_class = db.get_class_row(conn, package, class_name)
         if not root_class:
-            return {"error": "not_found", "message": f"Class {package}.{class_name} not found."}
-        
-        # We'll build the tree upwards (parents)
-        parents = []
-        current = root_class
-        visited = { (package, class_name) }
-        
-        while current and current.get("parent"):
-            parent_fqcn = current["parent"]
-            # Parent is just "ClassName" or "package.ClassName" or "ClassName<Generics>"
-            # Our extractor already cleaned Generics.
-            
-            # Find parent in DB
-            parent_info = _find_class_by_name_or_fqcn(conn, parent_fqcn, current["package"])
-            if parent_info:
-                if (parent_info["package"], parent_info["class_name"]) in visited:
-                    break # Loop detected
-                visited.add((parent_info["package"], parent_info["class_name"]))
-                parents.append({
-                    "package": parent_info["package"],
-                    "class_name": parent_info["class_name"],
-                    "kind": parent_info["kind"]
-                })
-                current = parent_info
-            else:
-                # Still add it as external
-                parents.append({"class_name": parent_fqcn, "external": True})
-                current = None # Stop search
-        
+            table = get_symbol_table(
+                str(db_path), generation, lambda: db.get_symbol_classes(conn), lambda: _load_symbol_members(db_path)
+            )
+            error = {"error": "not_found", "message": f"Class {package}.{class_name} not found."}
+            suggestions = table.suggest_classes(package, class_name)
+            if suggestions:
+                error["suggestions"] = suggestions
+            return error
+        ancestors = db.get_ancestors(conn, root_class["id"])
+        if ancestors is None:
+            return {"error": "no_type_closure", "message": "Index has no type hierarchy. Re-index with: prism ctx db --rebuild"}
+
+        #_ extends-only ancestors form the parent chain (an interface may extend several at one depth)
+        chain = [a for a in ancestors if a["via_extends"]]
+        parents = [{"package": a["package"], "class_name": a["class_name"], "kind": a["kind"]} for a in chain]
+        #_ The chain ends at a supertype that is not indexed (e.g. a JDK class)
+        tail_id = chain[-1]["id"] if chain else root_class["id"]
+        for ext in db.get_unresolved_supertypes(conn, [tail_id]):
+            if ext["via_extends"]:
+                parents.append({"class_name": ext["name"], "external": True})
+
         return {
             "class_name": class_name,
             "package": package,
             "kind": root_class["kind"],
             "parent_tree": parents,
-            "interfaces": root_class.get("interfaces", "").split(",") if root_class.get("interfaces") else []
+            "interfaces": root_class.get("interfaces", "").split(",") if root_class.get("interfaces") else [],
+            "supertypes": [
+                {"package": a["package"], "class_name": a["class_name"], "kind": a["kind"], "depth": a["depth"]}
+                for a in ancestors
+            ],
         }
 
-def _find_class_by_name_or_fqcn(conn, name_ref, current_package):
-    if "." in name_ref:
-        parts = name_ref.rsplit(".", 1)
-        return db.get_class_and_methods(conn, parts[0], parts[1])
-    else:
-        # Search in same package
-        res = db.get_class_and_methods(conn, current_package, name_ref)
-        if res: return res
-        
-        # Search globally if unique
-        rows = db.search_fts(conn, name_ref, limit=2)
-        if len(rows) == 1 or (len(rows) > 1 and all(r["class_name"] == name_ref for r in rows)):
-             # Heuristic: if only one class with that name exists, it's likely that one
-             return db.get_class_and_methods(conn, rows[0]["package"], rows[0]["class_name"])
-    return None
+
+def _load_symbol_members(db_path: Path) -> list[tuple[int, str]]:
+    """Member names for the symbol table (loaded later, on its own connection)."""
+    with db.read_connection(db_path) as conn:
+        return db.get_symbol_members(conn)
@@ -1,4 +1,4 @@
-# Use cases: get class, get method, list classes, index stats, context list.
+# Use cases: get class (single and batch), get method, list classes, index stats, context list.
 
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -16,20 +16,40 @@ def get_class(
     class_name: str,
     include_source: bool = False,
 ) -> tuple[dict | None, dict | None]:
-    """Return (class_data, None) or (None, error_dict)."""
+    """Return (class_data, None) or (None, error_dict). Cached per index generation (see result_cache)."""
     from ..domain.constants import normalize_version
-    from .read_source import read_source
+    from .result_cache import cached_call
 
     root = root or config_provider.get_project_root()
     version = normalize_version(version)
     db_path = config_provider.get_db_path(root, version)
     if not db_path.is_file():
         return (None, {"error": "no_db", "message": f"Database for version {version} does not exist."})
+    return cached_call(
+        "get_class",
+        version,
+        (package.strip(), class_name.strip(), include_source),
+        index_repository.get_generation(db_path),
+        lambda: _load_class(config_provider, index_repository, root, version, db_path, package, class_name, include_source),
+    )
+
+
+def _load_class(
+    config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
+    root: Path,
+    version: str,
+    db_path: Path,
+    package: str,
+    class_name: str,
+    include_source: bool,
+) -> tuple[dict | None, dict | None]:
+    from .read_source import read_source
+
     data = index_repository.get_class_and_methods(db_path, package, class_name)
     if data is None:
-        # Smart Suggestion: find class by name in other packages
-        from .search import search_api
-        suggestions, _ = search_api(config_provider, index_repository, root, version, class_name, unique_classes=True)
+        #_ Did you mean: same or similar class names in any package (typos allowed)
+        suggestions = _symbol_table(index_repository, db_path).suggest_classes(package.strip(), class_name.strip())
         if suggestions:
             message = f"Class {package}.{class_name} not found. Did you mean one of these?\n"
             for s in suggestions:
@@ -46,6 +66,59 @@ def get_class(
     return (data, None)
 
 
+#_ Classes per get_classes call
+GET_CLASSES_MAX = 100
+
+
+def get_classes(
+    config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
+    root: Path | None,
+    version: str,
+    keys: list[tuple[str, str]],
+    fields: list[str] | None = None,
+) -> tuple[dict | None, dict | None]:
+    """
+    Batch get_class: keys are (package, class_name) pairs (up to GET_CLASSES_MAX, duplicates ignored).
+    Return ({"classes": [...in request order], "not_found": [{"package", "class_name", "suggestions"}]}, None)
+    or (None, error_dict). fields projects each class (see db.CLASS_FIELDS); None returns everything.
+    """
+    from ..domain.constants import normalize_version
+    from ..infrastructure.db import CLASS_FIELDS
+
+    root = root or config_provider.get_project_root()
+    version = normalize_version(version)
+    db_path = config_provider.get_db_path(root, version)
+    if not db_path.is_file():
+        return (None, {"error": "no_db", "message": f"Database for version {version} does not exist."})
+    keys = list(dict.fromkeys((p.strip(), c.strip()) for p, c in keys if c and c.strip()))
+    if not keys:
+        return (None, {"error": "missing_params", "message": "Provide at least one class."})
+    if len(keys) > GET_CLASSES_MAX:
+        return (None, {"error": "too_many", "message": f"At most {GET_CLASSES_MAX} classes per call."})
+    if fields is not None:
+        unknown = [f for f in fields if f not in CLASS_FIELDS and f not in ("package", "class_name")]
+        if unknown:
+            return (None, {
+                "error": "invalid_fields",
+                "message": f"Unknown fields: {', '.join(unknown)}. Valid: {', '.join(CLASS_FIELDS)}.",
+            })
+
+    found = index_repository.get_classes(db_path, keys, set(fields) if fields is not None else None)
+    classes, not_found = [], []
+    for package, class_name in keys:
+        entry = found.get((package, class_name))
+        if entry is not None:
+            classes.append(entry)
+        else:
+            not_found.append({
+                "package": package,
+                "class_name": class_name,
+                "suggestions": _symbol_table(index_repository, db_path).suggest_classes(package, class_name),
+            })
+    return ({"classes": classes, "not_found": not_found}, None)
+
+
 def get_method(
     config_provider: "ConfigProvider",
     index_repository: "IndexRepository",
@@ -65,10 +138,31 @@ def get_method(
         return (None, {"error": "no_db", "message": f"Database for version {version} does not exist."})
     data = index_repository.get_method(db_path, package, class_name, method_name)
     if data is None:
-        return (None, {"error": "not_found", "message": f"Class {package}.{class_name} not found."})
+        suggestions = _symbol_table(index_repository, db_path).suggest_classes(package.strip(), class_name.strip())
+        error = {"error": "not_found", "message": f"Class {package}.{class_name} not found."}
+        if suggestions:
+            error["suggestions"] = suggestions
+        return (None, error)
+    if not data["methods"]:
+        #_ The class exists but has no such method: closest member names of the class
+        data["suggestions"] = _symbol_table(index_repository, db_path).suggest_members(
+            data["package"], data["class_name"], method_name.strip()
+        )
     return (data, None)
 
 
+def _symbol_table(index_repository: "IndexRepository", db_path: Path):
+    """Fuzzy symbol table of the index at db_path (see symbol_lookup)."""
+    from .symbol_lookup import get_symbol_table
+
+    return get_symbol_table(
+        str(db_path),
+        index_repository.get_generation(db_path),
+        lambda: index_repository.get_symbol_classes(db_path),
+        lambda: index_repository.get_symbol_members(db_path),
+    )
+
+
 def list_classes(
     config_provider: "ConfigProvider",
     index_repository: "IndexRepository",
@@ -99,7 +193,7 @@ def get_index_stats(
     root: Path | None,
     version: str | None,
 ) -> tuple[dict | None, dict | None]:
-    """Return ({"version", "classes", "methods"}, None) or (None, error_dict)."""
+    """Return ({"version", "classes", "methods", "constants", "result_cache"}, None) or (None, error_dict)."""
     from ..infrastructure import config_impl as _config
     from ..domain.constants import normalize_version
 
@@ -112,8 +206,16 @@ def get_index_stats(
     db_path = config_provider.get_db_path(root, resolved_version)
     if not db_path.is_file():
         return (None, {"error": "no_db", "message": f"Database for version {resolved_version or 'active'} does not exist. Run prism index first."})
+    from .result_cache import RESULT_CACHE
+
     classes, methods, constants = index_repository.get_stats(db_path)
-    return ({"version": resolved_version, "classes": classes, "methods": methods, "constants": constants}, None)
+    return ({
+        "version": resolved_version,
+        "classes": classes,
+        "methods": methods,
+        "constants": constants,
+        "result_cache": RESULT_CACHE.stats(),
+    }, None)
 
 
 def get_context_list(config_provider: "ConfigProvider", root: Path | None) -> dict:
@@ -0,0 +1,110 @@
+# In-memory LRU cache for use-case results (search, class lookup, hierarchy).
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+#_ Limits for the process-wide cache
+RESULT_CACHE_MAX_ENTRIES = 512
+RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate size of a result: length of its JSON form (what MCP tools send anyway)."""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU bounded by entry count and approximate size. Keys include the index generation,
+    so a re-index makes old entries unreachable (they age out of the LRU).
+    Values are deep-copied in and out: callers may mutate what they get.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """Returns (True, value) on hit, (False, None) on miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return (False, None)
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[0]
+        return (True, copy.deepcopy(value))
+
+    def put(self, key: tuple, value: Any) -> None:
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 3) if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+#_ Shared by all use cases of the process (one MCP server = one cache)
+RESULT_CACHE = ResultCache()
+
+
+def cached_call(
+    tool: str,
+    version: str,
+    args: tuple,
+    generation: str | None,
+    compute: Callable[[], Any],
+    should_cache: Callable[[Any], bool] | None = None,
+) -> Any:
+    """
+    Returns the cached result for (tool, version, generation, args) or runs compute() and stores it.
+    args must be hashable and already normalized. generation None (unknown index state) bypasses the cache.
+    should_cache: optional predicate to skip storing some results (e.g. errors that depend on the caller).
+    """
+    if generation is None:
+        return compute()
+    key = (tool, version, generation, args)
+    hit, value = RESULT_CACHE.get(key)
+    if hit:
+        return value
+    value = compute()
+    if should_cache is None or should_cache(value):
+        RESULT_CACHE.put(key, value)
+    return value
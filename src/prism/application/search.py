@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 
 from ..infrastructure import search_utils
+from .result_cache import cached_call
 
 def sanitize_fts_query(query: str) -> str:
     return search_utils.sanitize_fts_query(query)
@@ -29,6 +30,7 @@ def search_api(
     """
     Run FTS5 search. Returns (results, None) on success or ([], error_dict) on failure.
     t: optional i18n translate function for error messages.
+    Successful results are cached per index generation (see result_cache).
     """
     from ..domain.constants import normalize_version
 
@@ -45,6 +47,30 @@ def search_api(
         if t:
             msg = t("cli.query.no_db", version=version)
         return ([], {"error": "no_db", "message": msg})
+    try:
+        generation = index_repository.get_generation(db_path)
+        return cached_call(
+            "search_api",
+            version,
+            (term, limit, package_prefix, kind, unique_classes),
+            generation,
+            lambda: _run_search(index_repository, db_path, term, limit, package_prefix, kind, unique_classes, t),
+            should_cache=lambda res: res[1] is None,
+        )
+    except Exception as e:
+        return ([], {"error": "db", "message": str(e)})
+
+
+def _run_search(
+    index_repository: "IndexRepository",
+    db_path: Path,
+    term: str,
+    limit: int,
+    package_prefix: str | None,
+    kind: str | None,
+    unique_classes: bool,
+    t: callable = None,
+) -> tuple[list[dict], dict | None]:
     try:
         results = index_repository.search(
             db_path, term, limit=limit, package_prefix=package_prefix, kind=kind, unique_classes=unique_classes
@@ -0,0 +1,85 @@
+# In-memory symbol table per API index: fuzzy "did you mean" for classes and members.
+
+import threading
+from typing import Callable
+
+from ..domain.symbol_index import SymbolIndex, rank_names
+
+#_ Suggestions attached to a not_found error
+SYMBOL_SUGGESTIONS = 5
+
+
+class SymbolTable:
+    """
+    Every class of one index generation (trigram SymbolIndex over simple class names) and the member
+    (method and constant) names of each class. Members are loaded on the first member suggestion: class
+    lookups (the common miss) only pay for the classes.
+    """
+
+    def __init__(self, classes: list[dict], load_members: Callable[[], list[tuple[int, str]]]):
+        self.classes = [(c["package"], c["class_name"], c["kind"]) for c in classes]
+        self._class_ids = [c["id"] for c in classes]
+        self._positions = {(package, class_name): i for i, (package, class_name, _) in enumerate(self.classes)}
+        self._index = SymbolIndex([class_name for _, class_name, _ in self.classes])
+        self._load_members = load_members
+        self._members: dict[int, list[str]] | None = None
+        self._members_lock = threading.Lock()
+
+    def suggest_classes(self, package: str, class_name: str, limit: int = SYMBOL_SUGGESTIONS) -> list[dict]:
+        """Classes named like class_name (typos allowed), closest first; same package first on ties."""
+        hits = self._index.lookup(class_name, limit * 4)
+        hits.sort(key=lambda hit: (hit[1], self.classes[hit[0]][0] != package))
+        return [
+            {"package": self.classes[i][0], "class_name": self.classes[i][1], "kind": self.classes[i][2]}
+            for i, _ in hits[:limit]
+        ]
+
+    def suggest_members(self, package: str, class_name: str, name: str, limit: int = SYMBOL_SUGGESTIONS) -> list[str]:
+        """Method/constant names of package.class_name close to name."""
+        position = self._positions.get((package, class_name))
+        if position is None:
+            return []
+        return rank_names(name, self._get_members().get(self._class_ids[position], []), limit)
+
+    def _get_members(self) -> dict[int, list[str]]:
+        with self._members_lock:
+            if self._members is None:
+                members: dict[int, list[str]] = {}
+                for class_id, name in self._load_members():
+                    members.setdefault(class_id, []).append(name)
+                self._members = members
+            return self._members
+
+
+#_ db path -> (generation, table): one table per indexed version, replaced when the index is rewritten
+_tables: dict[str, tuple[str, SymbolTable]] = {}
+_tables_lock = threading.Lock()
+
+
+def get_symbol_table(
+    db_path_key: str,
+    generation: str | None,
+    load_classes: Callable[[], list[dict]],
+    load_members: Callable[[], list[tuple[int, str]]],
+) -> SymbolTable:
+    """
+    Returns the symbol table of an index, building it from load_classes() on first use and after every
+    re-index (load_members runs lazily, see SymbolTable). generation None (unknown index state) builds
+    a table that is not kept.
+    """
+    if generation is not None:
+        with _tables_lock:
+            cached = _tables.get(db_path_key)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+    table = SymbolTable(load_classes(), load_members)
+    if generation is not None:
+        with _tables_lock:
+            _tables[db_path_key] = (generation, table)
+    return table
+
+
+def clear_symbol_tables() -> None:
+    """Drops every loaded table."""
+    with _tables_lock:
+        _tables.clear()
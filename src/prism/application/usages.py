@@ -1,16 +1,17 @@
 # Use case: find usages of a class in the decompiled source code.
 
 import re
-import subprocess
+import sqlite3
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from ..ports import ConfigProvider
+    from ..ports import ConfigProvider, IndexRepository
 
 
 def find_usages(
     config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
     root: Path | None,
     version: str,
     target_class: str,
@@ -18,16 +19,15 @@ def find_usages(
 ) -> tuple[list[dict], dict | None]:
     """
     Search for usages of a class name in the decompiled Java source.
+    Whole-word occurrences come from the identifier index built while indexing; terms the index
+    does not hold (keywords, non-word characters) or DBs without it fall back to scanning the sources.
     Returns (results, None) or ([], error_dict).
     """
-    from ..domain.constants import normalize_version
+    from ..domain.constants import normalize_version, is_indexed_identifier
 
     root = root or config_provider.get_project_root()
     version = normalize_version(version)
-    source_dir = config_provider.get_decompiled_dir(root, version)
-
-    if not source_dir.is_dir():
-        return ([], {"error": "no_source", "message": f"Source directory for {version} not found."})
+    source_dir = config_provider.get_sources_dir(root, version)
 
     # We look for the class name. If it's a FQCN, we can try to be more specific.
     # But often people use simple names after import.
@@ -36,6 +36,44 @@ def find_usages(
     if "." in target_class:
         search_term = target_class.split(".")[-1]
 
+    if is_indexed_identifier(search_term):
+        db_path = config_provider.get_db_path(root, version)
+        if db_path.is_file():
+            try:
+                postings = index_repository.get_identifier_postings(db_path, search_term)
+            except sqlite3.Error:
+                postings = None
+            if postings is not None:
+                return (_usages_from_postings(source_dir, postings, limit), None)
+
+    if not source_dir.is_dir():
+        return ([], {"error": "no_source", "message": f"Source directory for {version} not found."})
+    return _scan_usages(source_dir, target_class, search_term, limit)
+
+
+def _usages_from_postings(source_dir: Path, postings: list[dict], limit: int) -> list[dict]:
+    """Turns identifier postings into usage results; only files that contribute results are read."""
+    results = []
+    for posting in postings:
+        if len(results) >= limit:
+            break
+        try:
+            lines = (source_dir / posting["file_path"]).read_text(encoding="utf-8", errors="replace").split("\n")
+        except OSError:
+            lines = []
+        for line_no in posting["lines"]:
+            results.append({
+                "file_path": posting["file_path"],
+                "line": line_no,
+                "content": lines[line_no - 1].strip() if line_no <= len(lines) else "",
+            })
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _scan_usages(source_dir: Path, target_class: str, search_term: str, limit: int) -> tuple[list[dict], dict | None]:
+    """Regex scan of every .java file (used when the identifier index cannot answer)."""
     results = []
     try:
         # Use findstr on Windows or grep/rg if available. 
@@ -0,0 +1,55 @@
+# Asset category classification: longest folder-prefix match over a path-segment trie.
+
+#_ Key of a trie node's category (cannot clash with a path segment: segments never contain '/')
+_CATEGORY = "/"
+
+
+class AssetCategoryClassifier:
+    """
+    Maps asset paths to categories by their longest matching folder prefix (e.g. with both "Item" and
+    "Item/Items" registered, "Item/Items/Sword.json" resolves to the latter). Prefixes are whole
+    '/'-separated segments: "Items" does not match "ItemsExtra/x.png". Lookup cost grows with the depth
+    of the path, not with the number of registered folders. Shared by the asset indexer and search filters.
+    """
+
+    def __init__(self, folder_map: dict[str, str]):
+        self._root: dict = {}
+        self._folders: dict[str, list[str]] = {}
+        for folder, category in folder_map.items():
+            node = self._root
+            for segment in folder.strip("/").split("/"):
+                node = node.setdefault(segment, {})
+            node[_CATEGORY] = category
+            self._folders.setdefault(category, []).append(folder)
+
+    def classify(self, path: str) -> str | None:
+        """Category of the deepest registered folder containing path, or None."""
+        segments = path.split("/")
+        node = self._root
+        found = None
+        #_ The last segment is the file name: a folder must contain the path, not be it
+        for segment in segments[:-1]:
+            node = node.get(segment)
+            if node is None:
+                break
+            found = node.get(_CATEGORY, found)
+        return found
+
+    def resolve(self, name: str) -> str | None:
+        """Category for a category name (case-insensitive) or a registered folder; None if unknown."""
+        folder = name.strip("/")
+        node = self._root
+        for segment in folder.split("/"):
+            node = node.get(segment) if node is not None else None
+        if node is not None and _CATEGORY in node:
+            return node[_CATEGORY]
+        lowered = name.lower()
+        return next((c for c in self._folders if c.lower() == lowered), None)
+
+    def folders(self, category: str) -> list[str]:
+        """Registered folders of a category."""
+        return list(self._folders.get(category, []))
+
+    def categories(self) -> list[str]:
+        """Every category, in registration order."""
+        return list(self._folders)
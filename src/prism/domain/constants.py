@@ -1,4 +1,6 @@
-# Shared domain constants (server versions).
+# Shared domain constants (server versions, identifier index tokens).
+
+import re
 
 VALID_SERVER_VERSIONS = ("release", "prerelease")
 
@@ -11,3 +13,32 @@ def normalize_version(version: str | None) -> str:
         return "release"
     v = str(version).strip().lower()
     return v if v in VALID_SERVER_VERSIONS else "release"
+
+
+#_ Tokens of the identifier index: the same words that \b...\b matches in a source scan
+RE_WORD_TOKEN = re.compile(r"\w+")
+#_ Word tokens of 2+ chars not starting with a digit (indexable candidates, before the keyword check)
+RE_IDENTIFIER_TOKEN = re.compile(r"\b[^\W\d]\w+")
+
+#_ Java keywords and literals: never indexed as identifiers (usage lookups for them scan the sources)
+JAVA_RESERVED_WORDS = frozenset((
+    "abstract", "assert", "boolean", "break", "byte", "case", "catch", "char", "class", "const",
+    "continue", "default", "do", "double", "else", "enum", "extends", "final", "finally", "float",
+    "for", "goto", "if", "implements", "import", "instanceof", "int", "interface", "long", "native",
+    "new", "package", "private", "protected", "public", "return", "short", "static", "strictfp",
+    "super", "switch", "synchronized", "this", "throw", "throws", "transient", "try", "void",
+    "volatile", "while", "true", "false", "null", "var", "record", "yield", "sealed", "permits",
+))
+
+
+def is_indexed_identifier(name: str) -> bool:
+    """
+    True if name is stored in the identifier index: a whole word token (regex \\w+) of 2+ chars
+    that does not start with a digit and is not a Java keyword.
+    """
+    return (
+        len(name) >= 2
+        and RE_WORD_TOKEN.fullmatch(name) is not None
+        and not name[0].isdigit()
+        and name not in JAVA_RESERVED_WORDS
+    )
@@ -0,0 +1,163 @@
+# Fuzzy symbol lookup ("did you mean"): trigram candidates ranked by edit distance.
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+#_ Candidates (most shared trigrams) that get an edit distance computed
+SYMBOL_RANK_CANDIDATES = 48
+
+#_ Trigram postings counted per lookup, rarest trigrams first (common ones such as "ent" add little)
+SYMBOL_SCAN_MAX_POSTINGS = 5000
+
+#_ Queries up to this length skip the trigram filter: a swap leaves them one shared trigram or none
+SYMBOL_SHORT_QUERY = 4
+
+
+def trigrams(name: str) -> set[str]:
+    """Lowercase trigrams of a name, padded so short names and word edges get their own grams."""
+    padded = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (insert, delete, substitute, swap of adjacent characters), with
+    Hyyrö's bit-parallel algorithm: one pass over b with a bit per character of a. Results above
+    max_distance are returned as max_distance + 1.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    m = len(a)
+    if not m:
+        return min(len(b), max_distance + 1)
+    peq: dict[str, int] = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp, vn, d0, pm_prev, score = mask, 0, 0, 0, m
+    for ch in b:
+        pm = peq.get(ch, 0)
+        #_ Diagonal zero: match, vertical carry, or a transposition with the previous column
+        d0 = ((((~d0) & pm) << 1) & pm_prev) | ((((pm & vp) + vp) & mask) ^ vp) | pm | vn
+        hp = vn | (~(d0 | vp) & mask)
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+        pm_prev = pm
+    return min(score, max_distance + 1)
+
+
+def max_typos(name: str) -> int:
+    """Edit distance tolerated for a query: 1 for short names, about one typo per four characters."""
+    return max(1, len(name) // 4)
+
+
+def rank_names(query: str, names: list[str], limit: int = 5) -> list[str]:
+    """
+    Brute-force "did you mean" over a short list (e.g. the members of one class): names within
+    max_typos of query or containing it, closest first.
+    """
+    q = query.lower()
+    limit_distance = max_typos(q)
+    scored = []
+    for name in set(names):
+        lowered = name.lower()
+        distance = edit_distance(q, lowered, limit_distance)
+        if distance <= limit_distance or q in lowered:
+            scored.append((distance, len(name), name))
+    return [name for _, _, name in sorted(scored)[:limit]]
+
+
+class SymbolIndex:
+    """
+    Trigram index over a list of names (e.g. every class name of an API index). Postings are sorted by
+    name length, so a lookup only counts names whose length is within max_typos of the query; the best
+    candidates are then ranked by edit distance, so a misspelled name ("PlayerSpwanEvent") still finds
+    its symbol. Longer names that contain the query are found through its rarest inner trigram.
+    Entries are positions in names.
+    """
+
+    def __init__(self, names: list[str]):
+        self._names = [n.lower() for n in names]
+        self._exact: dict[str, list[int]] = {}
+        postings: dict[str, list[int]] = {}
+        for i, name in enumerate(self._names):
+            self._exact.setdefault(name, []).append(i)
+            for gram in trigrams(name):
+                postings.setdefault(gram, []).append(i)
+        #_ gram -> (name lengths, entries), both ordered by length (bisect selects a length window)
+        self._postings: dict[str, tuple[list[int], list[int]]] = {}
+        for gram, ids in postings.items():
+            ids.sort(key=lambda i: len(self._names[i]))
+            self._postings[gram] = ([len(self._names[i]) for i in ids], ids)
+        #_ Every entry ordered by length, for queries too short for the trigram bound
+        by_length = sorted(range(len(self._names)), key=lambda i: len(self._names[i]))
+        self._by_length = ([len(self._names[i]) for i in by_length], by_length)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _window(self, gram: str | None, min_length: int, max_length: int) -> tuple[list[int], int, int]:
+        """(entries, start, end): entries[start:end] are those of gram (None: all) with a name length in [min_length, max_length]."""
+        found = self._by_length if gram is None else self._postings.get(gram)
+        if found is None:
+            return ([], 0, 0)
+        lengths, ids = found
+        return (ids, bisect_left(lengths, min_length), bisect_right(lengths, max_length))
+
+    def lookup(self, query: str, limit: int = 10) -> list[tuple[int, int]]:
+        """
+        (entry, distance) pairs, closest first: exact (case-insensitive) matches and names within
+        max_typos of query, then longer names containing it (shortest first).
+        """
+        q = query.strip().lower()
+        if not q:
+            return []
+        limit_distance = max_typos(q)
+        low, high = len(q) - limit_distance, len(q) + limit_distance
+        windows = sorted((self._window(gram, low, high) for gram in trigrams(q)), key=lambda w: w[2] - w[1])
+        counts: Counter = Counter()
+        scanned = 0
+        counted = 0
+        for ids, start, end in windows:
+            if scanned and scanned + end - start > SYMBOL_SCAN_MAX_POSTINGS:
+                break
+            counts.update(ids[start:end])
+            scanned += end - start
+            counted += 1
+        #_ q-gram lemma: one edit changes at most 3 trigrams, and an adjacent swap (one edit for
+        #_ edit_distance) 4, so a name within limit_distance shares at least counted - 4 * limit_distance
+        min_shared = counted - 4 * limit_distance
+        candidates = set(self._exact.get(q, ()))
+        if len(q) > SYMBOL_SHORT_QUERY:
+            candidates.update(i for i, n in counts.most_common(SYMBOL_RANK_CANDIDATES) if n >= min_shared)
+        else:
+            #_ Short query: every name of a close length is a candidate
+            ids, start, end = self._window(None, low, high)
+            candidates.update(ids[start:end])
+        scored = []
+        for i in candidates:
+            distance = edit_distance(q, self._names[i], limit_distance)
+            if distance <= limit_distance:
+                scored.append((distance, -counts[i], len(self._names[i]), i))
+        scored.sort()
+        found = [(i, distance) for distance, _, _, i in scored[:limit]]
+
+        #_ Containment: every name holding q has all its inner trigrams; the rarest one bounds the scan
+        inner = [gram for gram in trigrams(q) if " " not in gram]
+        if len(found) < limit and inner:
+            seen = {i for i, _ in found}
+            ids, start, end = min((self._window(gram, high + 1, 1 << 30) for gram in inner), key=lambda w: w[2] - w[1])
+            for i in ids[start:end]:
+                if i not in seen and q in self._names[i]:
+                    found.append((i, edit_distance(q, self._names[i], limit_distance)))
+                    if len(found) >= limit:
+                        break
+        return found
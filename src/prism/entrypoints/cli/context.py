@@ -106,6 +106,8 @@ def init_cmd(
     all_versions: Annotated[bool, typer.Option("--all", "-a", help=i18n.t("cli.init.all_help"))] = False,
     include_assets: Annotated[bool, typer.Option("--assets", help=i18n.t("cli.init.assets_help"))] = False,
     engine: Annotated[Optional[str], typer.Option("--engine", "-e", help=i18n.t("cli.context.engine_help"))] = None,
+    jobs: Annotated[Optional[int], typer.Option("--jobs", "-j", min=1, help=i18n.t("cli.context.jobs_help"))] = None,
+    rebuild: Annotated[bool, typer.Option("--rebuild", help=i18n.t("cli.context.rebuild_help"))] = False,
 ) -> int:
     """Full pipeline: detects, decompiles, and indexes."""
     root: Path = ctx.obj["root"]
@@ -134,7 +136,7 @@ def init_cmd(
     out.warn(i18n.t("cli.decompile.may_take"))
     
     #_ run_decompile_only already handles its own Progress bar
-    success, result = decompile.run_decompile_only(root, versions=versions_list, engine_name=engine)
+    success, result = decompile.run_decompile_only(root, versions=versions_list, engine_name=engine, rebuild=rebuild)
     
     if not success:
         out.error(i18n.t("cli.build.decompile_failed"))
@@ -155,7 +157,7 @@ def init_cmd(
     out.phase(i18n.t("cli.build.phase_index"))
     for v in versions_list:
         #_ extractor.run_index already handles its own Progress bar
-        ok, payload = extractor.run_index(root, v)
+        ok, payload = extractor.run_index(root, v, jobs=jobs, rebuild=rebuild)
         if ok:
             classes, methods, constants = payload
             out.success(i18n.t("cli.build.indexed", version=v, classes=classes, methods=methods, constants=constants))
@@ -181,8 +183,13 @@ def init_cmd(
                 def progress(path, current, total):
                     p.update(task, completed=current, total=total, filename=f" [cyan]{Path(path).name}[/cyan]")
                 
-                use_cases.index_assets(db_path, assets_zip, v, progress)
+                stats = use_cases.index_assets(
+                    db_path, assets_zip, v, progress, jobs=jobs, rebuild=rebuild,
+                    api_db_path=config_impl.get_db_path(root, v), sources_dir=config_impl.get_sources_dir(root, v),
+                )
             out.success(i18n.t("cli.assets.success", version=v))
+            if stats:
+                out.phase(i18n.t("cli.assets.delta", **stats))
 
     out.success(i18n.t("cli.build.success"))
     return 0
@@ -240,6 +247,7 @@ def decompile_cmd(
     ctx: typer.Context,
     version: Annotated[Optional[str], typer.Argument(help="Specific version to decompile (release, prerelease), or 'all'.")] = None,
     engine: Annotated[Optional[str], typer.Option("--engine", "-e", help=i18n.t("cli.context.engine_help"))] = None,
+    rebuild: Annotated[bool, typer.Option("--rebuild", help=i18n.t("cli.context.rebuild_decompile_help"))] = False,
 ) -> int:
     """Decompiles the JAR directly into workspace/sources."""
     root: Path = ctx.obj["root"]
@@ -257,7 +265,7 @@ def decompile_cmd(
     out.warn(i18n.t("cli.decompile.may_take"))
     
     #_ Removed nested out.status
-    success, result = decompile.run_decompile_only(root, versions=versions, engine_name=engine)
+    success, result = decompile.run_decompile_only(root, versions=versions, engine_name=engine, rebuild=rebuild)
 
     if success:
         if isinstance(result, list):
@@ -279,6 +287,8 @@ def decompile_cmd(
 def db_cmd(
     ctx: typer.Context,
     version: Annotated[Optional[str], typer.Argument(help="Specific version to index (release, prerelease), or 'all'.")] = None,
+    jobs: Annotated[Optional[int], typer.Option("--jobs", "-j", min=1, help=i18n.t("cli.context.jobs_help"))] = None,
+    rebuild: Annotated[bool, typer.Option("--rebuild", help=i18n.t("cli.context.rebuild_help"))] = False,
 ) -> int:
     """Indexes the code into the DB (FTS5)."""
     root: Path = ctx.obj["root"]
@@ -293,7 +303,7 @@ def db_cmd(
 
     for v in versions_to_index:
         #_ Removed nested out.status
-        ok, payload = extractor.run_index(root, v)
+        ok, payload = extractor.run_index(root, v, jobs=jobs, rebuild=rebuild)
         if ok:
             classes, methods, constants = payload
             out.success(i18n.t("cli.index.success", classes=classes, methods=methods, constants=constants, version=v))
@@ -359,6 +369,8 @@ def use_cmd(
 def assets_cmd(
     ctx: typer.Context,
     version: Annotated[Optional[str], typer.Argument(help="Specific version to index assets (release, prerelease), or 'all'.")] = None,
+    jobs: Annotated[Optional[int], typer.Option("--jobs", "-j", min=1, help=i18n.t("cli.context.assets_jobs_help"))] = None,
+    rebuild: Annotated[bool, typer.Option("--rebuild", help=i18n.t("cli.context.rebuild_assets_help"))] = False,
 ) -> int:
     """Indexes assets from Assets.zip."""
     root: Path = ctx.obj["root"]
@@ -382,6 +394,11 @@ def assets_cmd(
             def progress(path, current, total):
                 p.update(task, completed=current, total=total, filename=f" [cyan]{Path(path).name}[/cyan]")
             
-            use_cases.index_assets(db_path, assets_zip, v, progress)
+            stats = use_cases.index_assets(
+                db_path, assets_zip, v, progress, jobs=jobs, rebuild=rebuild,
+                api_db_path=config_impl.get_db_path(root, v), sources_dir=config_impl.get_sources_dir(root, v),
+            )
         out.success(i18n.t("cli.assets.success", version=v))
+        if stats:
+            out.phase(i18n.t("cli.assets.delta", **stats))
     return 0
@@ -16,6 +16,9 @@ from ...infrastructure.file_config import FileConfigProvider
 from ...infrastructure.sqlite_repository import SqliteIndexRepository
 from . import out
 
+#_ Values listed per facet under asset results
+QUERY_FACETS_SHOWN = 10
+
 #_ Create a dynamic Enum for the server versions for Typer's choice validation
 VersionEnum = Enum("VersionEnum", {v: v for v in VALID_SERVER_VERSIONS})
 
@@ -25,7 +28,7 @@ def query_callback(
     version: Annotated[VersionEnum, typer.Option("--version", "-v", help=i18n.t("cli.query.version_help"))] = VersionEnum.release,
     json_output: Annotated[bool, typer.Option("--json", "-j", help=i18n.t("cli.query.json_help"))] = False,
     limit: Annotated[int, typer.Option("--limit", "-n", help=i18n.t("cli.query.limit_help"))] = 30,
-    assets: Annotated[bool, typer.Option("--assets", "-a", help="Busca en el índice de assets en lugar de la API de código.")] = False,
+    assets: Annotated[bool, typer.Option("--assets", "-a", help=i18n.t("cli.query.assets_help"))] = False,
 ) -> int:
     """
     Executes an FTS5 search in the DB for the given version.
@@ -50,10 +53,16 @@ def query_callback(
         use_cases = assets_use_cases.AssetsUseCases(repo)
         
         with out.status(f"Buscando asset '{term}' en {version_str}..."):
-            results = use_cases.search_assets(db_path, term, limit)
+            found, err = use_cases.search_assets_faceted(db_path, term, limit, t=i18n.t)
+        if err is not None:
+            out.error(err["message"])
+            if err.get("hint"):
+                out.error(err["hint"])
+            raise typer.Exit(code=1)
+        results = found["results"]
             
         if json_output:
-            print(json.dumps([vars(a) for a in results], ensure_ascii=False))
+            print(json.dumps({**found, "results": [vars(a) for a in results]}, ensure_ascii=False))
             return 0
             
         if not results:
@@ -77,6 +86,11 @@ def query_callback(
             data.append(row)
             
         out.table(title="Resultados de Assets", data=data, columns=["path", "category", "id", "dims", "size"])
+        for facet in ("category", "extension"):
+            counts = found["facets"][facet]
+            if counts:
+                summary = ", ".join(f"{value} ({n})" for value, n in list(counts.items())[:QUERY_FACETS_SHOWN])
+                out.phase(i18n.t(f"cli.query.assets_facet_{facet}", total=found["total"], values=summary))
         return 0
 
     config_provider = FileConfigProvider()
@@ -3,6 +3,7 @@ from mcp.server.fastmcp import FastMCP
 from ...infrastructure.file_config import FileConfigProvider
 from ...infrastructure.sqlite_repository import SqliteIndexRepository
 from ...infrastructure.sqlite_assets_repository import SqliteAssetsRepository
+from ...infrastructure import db, zip_cache
 from .bootstrap import register_all_tools
 
 def run(transport: str = "stdio", host: str = "127.0.0.1", port: int = 8000):
@@ -23,3 +24,7 @@ def run(transport: str = "stdio", host: str = "127.0.0.1", port: int = 8000):
         app.run(transport=transport)
     except KeyboardInterrupt:
         pass
+    finally:
+        #_ Release pooled read connections (and their mmap) and cached Assets.zip handles on shutdown
+        db.close_read_pools()
+        zip_cache.close_zip_cache()
@@ -3,6 +3,7 @@ import json
 from mcp.server.fastmcp import FastMCP
 from .... import i18n
 from ....application import get_call_flow as app_get_call_flow
+from ....application import get_call_graph as app_get_call_graph
 from ....domain.constants import normalize_version
 from ....ports.config_provider import ConfigProvider
 from ....ports.index_repository import IndexRepository
@@ -15,11 +16,17 @@ def register(app: FastMCP, config: ConfigProvider, repository: IndexRepository):
         method_name: str,
         version: str = "release",
         limit: int = 100,
+        mode: str = "usages",
+        depth: int = 1,
     ) -> str:
         norm_version = normalize_version(version)
         limit = max(1, min(int(limit), 500))
+        mode = (mode or "usages").strip().lower()
         
-        data, err = app_get_call_flow(config, repository, None, norm_version, target_class, method_name, limit)
+        if mode == "usages":
+            data, err = app_get_call_flow(config, repository, None, norm_version, target_class, method_name, limit)
+        else:
+            data, err = app_get_call_graph(config, repository, None, norm_version, target_class, method_name, mode, depth, limit)
         if err: return json.dumps(err, ensure_ascii=False)
         
         return json.dumps(data, ensure_ascii=False)
@@ -1,6 +1,7 @@
 # src/prism/entrypoints/mcp/tools/assets.py
-import json
 import base64
+import codecs
+import json
 from mcp.server.fastmcp import FastMCP
 from .... import i18n
 from ....application.assets_use_cases import AssetsUseCases
@@ -9,6 +10,28 @@ from ....ports.config_provider import ConfigProvider
 from ....ports.assets_repository import AssetsRepository
 from ....infrastructure import config_impl
 
+#_ Assets up to this size are returned whole; also the largest window a single call returns
+INSPECT_MAX_BYTES = 50_000
+
+#_ Window returned for larger assets when no length is given
+INSPECT_PREVIEW_BYTES = 512
+
+
+def _decode_utf8_window(data: bytes, cut_start: bool, cut_end: bool) -> str | None:
+    """
+    Decodes a byte window as UTF-8, or None if it is not text. A window may start or end inside a
+    multi-byte character: leading continuation bytes are skipped and a trailing partial character is dropped.
+    """
+    start = 0
+    if cut_start:
+        while start < min(3, len(data)) and (data[start] & 0xC0) == 0x80:
+            start += 1
+    try:
+        return codecs.getincrementaldecoder('utf-8')().decode(data[start:], final=not cut_end)
+    except UnicodeDecodeError:
+        return None
+
+
 def register(app: FastMCP, config: ConfigProvider, repo: AssetsRepository):
     """Registers asset-related tools."""
     
@@ -25,12 +48,14 @@ def register(app: FastMCP, config: ConfigProvider, repo: AssetsRepository):
         if not db_path.exists():
             return json.dumps({"error": "db_not_found", "message": f"Assets database for {norm_version} not found."}, ensure_ascii=False)
         
-        #_ search_assets now needs db_path
-        results = use_cases.search_assets(db_path, query, limit)
+        #_ Filters (cat:, ext:, w>=, size<) run on indexed columns; free text on FTS
+        found, err = use_cases.search_assets_faceted(db_path, query, limit)
+        if err:
+            return json.dumps(err, ensure_ascii=False)
         
         #_ Format results for better readability in MCP
         formatted = []
-        for a in results:
+        for a in found["results"]:
             item = {
                 "path": a.path,
                 "category": a.category,
@@ -45,13 +70,19 @@ def register(app: FastMCP, config: ConfigProvider, repo: AssetsRepository):
         return json.dumps({
             "version": norm_version,
             "query": query,
+            "filters": found["filters"],
             "count": len(formatted),
+            "total": found["total"],
+            "facets": found["facets"],
             "results": formatted
         }, ensure_ascii=False, indent=2)
 
     def prism_inspect_asset(
         asset_path: str,
-        version: str = "release"
+        version: str = "release",
+        offset: int = 0,
+        length: int | None = None,
+        head: bool = False
     ) -> str:
         """Extracts the content of an asset. For text files returns string, for binary returns base64."""
         norm_version = normalize_version(version)
@@ -66,8 +97,8 @@ def register(app: FastMCP, config: ConfigProvider, repo: AssetsRepository):
         if not assets_zip or not assets_zip.exists():
              return json.dumps({"error": "assets_not_found", "message": f"Assets.zip for {norm_version} not found."}, ensure_ascii=False)
 
-        data = use_cases.inspect_asset_file(assets_zip, asset_path)
-        if data is None:
+        entry = use_cases.get_asset_entry(assets_zip, asset_path)
+        if entry is None:
             return json.dumps({"error": "asset_not_found", "message": f"Asset {asset_path} not found in {norm_version}."}, ensure_ascii=False)
         
         result = {
@@ -75,39 +106,89 @@ def register(app: FastMCP, config: ConfigProvider, repo: AssetsRepository):
             "version": norm_version,
             "category": info.category if info else None,
             "internal_id": info.internal_id if info else None,
+            **entry,
         }
         
         if info and info.width and info.height:
             result["dimensions"] = f"{info.width}x{info.height}"
 
+        #_ head: central directory facts only, nothing is inflated
+        if head:
+            return json.dumps(result, ensure_ascii=False, indent=2)
+
+        total = entry["size_bytes"]
+        offset = max(0, offset)
+        if length is None:
+            #_ Small assets are returned whole; larger ones only a preview window unless a length is given
+            length = total if offset == 0 and total <= INSPECT_MAX_BYTES else INSPECT_PREVIEW_BYTES
+        length = max(0, min(length, INSPECT_MAX_BYTES))
+
+        window = use_cases.read_asset_window(assets_zip, asset_path, offset, length)
+        if window is None:
+            return json.dumps({"error": "asset_not_found", "message": f"Asset {asset_path} not found in {norm_version}."}, ensure_ascii=False)
+        data, total = window
+        offset = min(offset, total)
+        end = offset + len(data)
+        result["offset"] = offset
+        result["length"] = len(data)
+        if offset > 0 or end < total:
+            result["is_truncated"] = True
+            result["content_summary"] = f"File has {total} bytes. Showing bytes {offset}-{end}; use offset/length to read another window."
+            if end < total:
+                result["next_offset"] = end
+
         #_ Try to decode as UTF-8, if fails, return base64
-        try:
-            content = data.decode('utf-8')
-            
-            #_ If content is too large (> 50KB), offer a summary/truncate
-            if len(content) > 50000:
-                result["content_summary"] = f"File is too large ({len(content)} bytes). Showing first 500 characters."
-                result["content"] = content[:500] + "\n... [TRUNCATED] ..."
-                result["is_truncated"] = True
-            else:
-                result["content"] = content
-                
+        content = _decode_utf8_window(data, cut_start=offset > 0, cut_end=end < total)
+        if content is not None:
+            result["content"] = content
             result["encoding"] = "utf-8"
-        except UnicodeDecodeError:
-            b64 = base64.b64encode(data).decode('ascii')
-            #_ base64 also truncated if too large
-            if len(b64) > 100000:
-                 result["content"] = b64[:1000] + "... [BASE64 TRUNCATED] ..."
-                 result["is_truncated"] = True
-            else:
-                 result["content"] = b64
+        else:
+            result["content"] = base64.b64encode(data).decode('ascii')
             result["encoding"] = "base64"
         
         return json.dumps(result, ensure_ascii=False, indent=2)
 
+    def prism_asset_refs(
+        asset_path: str,
+        version: str = "release",
+        direction: str = "forward",
+        depth: int = 1,
+        limit: int = 100
+    ) -> str:
+        norm_version = normalize_version(version)
+        db_path = config_impl.get_assets_db_path(None, norm_version)
+        if not db_path.exists():
+            return json.dumps({"error": "db_not_found", "message": f"Assets database for {norm_version} not found."}, ensure_ascii=False)
+
+        data, err = use_cases.get_asset_references(db_path, asset_path, direction=direction, depth=depth, limit=limit)
+        if err:
+            return json.dumps(err, ensure_ascii=False)
+        return json.dumps({"version": norm_version, **data}, ensure_ascii=False, indent=2)
+
+    def prism_asset_code_links(
+        category: str | None = None,
+        class_name: str | None = None,
+        asset: str | None = None,
+        version: str = "release"
+    ) -> str:
+        norm_version = normalize_version(version)
+        db_path = config_impl.get_assets_db_path(None, norm_version)
+        if not db_path.exists():
+            return json.dumps({"error": "db_not_found", "message": f"Assets database for {norm_version} not found."}, ensure_ascii=False)
+
+        api_db_path = config_impl.get_db_path(None, norm_version)
+        data, err = use_cases.get_code_links(db_path, api_db_path, category=category, class_name=class_name, asset=asset)
+        if err:
+            return json.dumps(err, ensure_ascii=False)
+        return json.dumps({"version": norm_version, **data}, ensure_ascii=False, indent=2)
+
     #_ Set descriptions from i18n
-    prism_search_assets.__doc__ = "Busca assets de Hytale por ruta, ID interno (en JSONs) o categoría (ej: Block, AmbienceFX). Retorna dimensiones para imágenes."
-    prism_inspect_asset.__doc__ = "Inspecciona el contenido de un asset. Devuelve el contenido (texto o base64) junto con metadatos técnicos y categoría detectada."
+    prism_search_assets.__doc__ = i18n.t("mcp.tools.prism_search_assets.description")
+    prism_inspect_asset.__doc__ = i18n.t("mcp.tools.prism_inspect_asset.description")
+    prism_asset_refs.__doc__ = i18n.t("mcp.tools.prism_asset_refs.description")
+    prism_asset_code_links.__doc__ = i18n.t("mcp.tools.prism_asset_code_links.description")
     
     app.tool()(prism_search_assets)
     app.tool()(prism_inspect_asset)
+    app.tool()(prism_asset_refs)
+    app.tool()(prism_asset_code_links)
@@ -4,6 +4,7 @@ from mcp.server.fastmcp import FastMCP
 from .... import i18n
 from ....application import (
     get_class as app_get_class,
+    get_classes as app_get_classes,
     get_method as app_get_method,
     get_hierarchy as app_get_hierarchy,
 )
@@ -44,6 +45,22 @@ def register(app: FastMCP, config: ConfigProvider, repository: IndexRepository):
     prism_get_class.__doc__ = i18n.t("mcp.tools.prism_get_class.description")
     app.tool()(prism_get_class)
 
+    def prism_get_classes(
+        version: str,
+        fqcns: list[str],
+        fields: list[str] | None = None,
+    ) -> str:
+        norm_version = normalize_version(version)
+        #_ Simple names (no package) are kept: they land in not_found with suggestions, like prism_get_class
+        keys = [parse_fqcn(f) or ("", (f or "").strip()) for f in fqcns or []]
+        data, err = app_get_classes(config, repository, None, norm_version, keys, fields)
+        if err is not None:
+            return json.dumps(err, ensure_ascii=False)
+        return json.dumps({"version": norm_version, "count": len(data["classes"]), **data}, ensure_ascii=False)
+
+    prism_get_classes.__doc__ = i18n.t("mcp.tools.prism_get_classes.description")
+    app.tool()(prism_get_classes)
+
     def prism_get_method(version: str, package: str, class_name: str, method_name: str) -> str:
         norm_version = normalize_version(version)
         if not (package or "").strip() or not (class_name or "").strip() or not (method_name or "").strip():
@@ -29,7 +29,7 @@ def register(app: FastMCP, config: ConfigProvider, repository: IndexRepository):
     def prism_fts_help() -> str:
         return (
             "FTS5 search syntax (prism_search):\n"
-            "- Single word: matches that token.\n"
+            "- Single word: matches that token, and also camel-case parts of names (Spawn finds PlayerSpawnEvent and onEntitySpawned; PlayerSpawn finds PlayerSpawnEvent).\n"
             '- Quoted phrase: "exact phrase" matches the exact phrase.\n'
             "- AND: term1 AND term2 (both must appear).\n"
             "- OR: term1 OR term2 (either can appear).\n"
@@ -17,7 +17,7 @@ def register(app: FastMCP, config: ConfigProvider, repository: IndexRepository):
         limit: int = 100,
     ) -> str:
         norm_version = normalize_version(version)
-        results, err = app_find_usages(config, None, norm_version, target_class, limit=limit)
+        results, err = app_find_usages(config, repository, None, norm_version, target_class, limit=limit)
         if err is not None:
             return json.dumps(err, ensure_ascii=False)
         return json.dumps({
@@ -0,0 +1,106 @@
+# Asset <-> code linkage: which API classes load each asset category (precomputed into the assets DB).
+
+import sqlite3
+from pathlib import Path
+
+from ..domain.constants import RE_IDENTIFIER_TOKEN
+from . import db
+
+#_ Class names tried for a category (e.g. Block -> Block, BlockType, BlockAsset, BlockConfig)
+CLASS_NAME_SUFFIXES = ("", "Type", "Asset", "Config")
+
+#_ Source files checked for a folder literal per category (after narrowing by the identifier index)
+LITERAL_SCAN_MAX_FILES = 200
+
+
+def _name_links(conn, category: str) -> list[tuple[str, str, str]]:
+    """
+    (package, class_name, evidence) for classes named after the category; "codec" if the class source mentions
+    CODEC (identifier index: constants miss generic declarations such as AssetCodec<String, BlockType> CODEC).
+    """
+    names = [category + suffix for suffix in CLASS_NAME_SUFFIXES]
+    rows = conn.execute(
+        f"""SELECT c.package, c.class_name,
+                   EXISTS (
+                       SELECT 1 FROM api.identifiers i
+                       JOIN api.identifier_postings p ON p.identifier_id = i.id
+                       JOIN api.files f ON f.id = p.file_id
+                       WHERE i.name = 'CODEC' AND f.path = c.file_path
+                   ) AS has_codec
+            FROM api.classes c
+            WHERE c.class_name IN ({",".join("?" * len(names))})""",
+        names,
+    ).fetchall()
+    return [(r["package"], r["class_name"], "codec" if r["has_codec"] else "name") for r in rows]
+
+
+def _literal_links(conn, folder: str, sources_dir: Path | None) -> list[tuple[str, str, str]]:
+    """
+    (package, class_name, "path_literal") for classes whose source contains the folder as a string literal
+    (typically the asset store registration). Files are narrowed with the identifier index (every word of
+    the folder must appear) and constants, then confirmed by reading the source.
+    """
+    literal = f'"{folder}"'
+    links = [
+        (r["package"], r["class_name"], "path_literal")
+        for r in conn.execute(
+            """SELECT DISTINCT c.package, c.class_name
+               FROM api.constants k JOIN api.classes c ON c.id = k.class_id
+               WHERE instr(k.value, ?) > 0""",
+            (literal,),
+        )
+    ]
+    if sources_dir is None or not sources_dir.is_dir():
+        return links
+
+    words = sorted(set(RE_IDENTIFIER_TOKEN.findall(folder)), key=len, reverse=True)
+    if not words:
+        return links
+    try:
+        rows = conn.execute(
+            f"""SELECT f.path
+                FROM api.files f
+                WHERE {" AND ".join(
+                    "EXISTS (SELECT 1 FROM api.identifier_postings p JOIN api.identifiers i ON i.id = p.identifier_id "
+                    "WHERE i.name = ? AND p.file_id = f.id)" for _ in words
+                )}
+                LIMIT ?""",
+            (*words, LITERAL_SCAN_MAX_FILES),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        #_ API index without the identifier index: constants only
+        return links
+    for r in rows:
+        try:
+            content = (sources_dir / r["path"]).read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            continue
+        if literal not in content:
+            continue
+        for c in conn.execute("SELECT package, class_name FROM api.classes WHERE file_path = ?", (r["path"],)):
+            links.append((c["package"], c["class_name"], "path_literal"))
+    return links
+
+
+def build_asset_code_links(
+    assets_db_path: Path,
+    api_db_path: Path,
+    sources_dir: Path | None,
+    category_map: dict[str, str],
+) -> int:
+    """
+    Recomputes asset_code_links in the assets DB: for every (folder, category) of category_map, the API
+    classes named after the category (name/codec evidence) and those whose source registers the folder
+    (path_literal evidence). The API DB is ATTACHed as "api" for the duration. Returns the number of links,
+    or 0 if the API DB does not exist (links are left untouched).
+    """
+    if not api_db_path.is_file() or not assets_db_path.is_file():
+        return 0
+    with db.connection(assets_db_path) as conn, db.attached(conn, api_db_path, "api"):
+        rows: set[tuple[str, str, str, str, str]] = set()
+        for folder, category in category_map.items():
+            for package, class_name, evidence in _name_links(conn, category) + _literal_links(conn, folder, sources_dir):
+                rows.add((category, folder, package, class_name, evidence))
+        db.replace_asset_code_links(conn, sorted(rows))
+        conn.commit()
+    return len(rows)
@@ -1,12 +1,51 @@
-# src/prism/infrastructure/assets_indexer.py
 import json
+import os
+import re
 import zipfile
 import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
+from ..domain.asset_category import AssetCategoryClassifier
 from . import db
 
+#_ Extensions whose (JSON) content is indexed as metadata
+METADATA_EXTENSIONS = ('.json', '.blockymodel', '.blockyanim', '.item', '.recipe', '.entity', '.particlespawner', '.particlesystem')
+
+#_ Limit size to avoid memory issues with huge files
+METADATA_MAX_BYTES = 1024 * 512
+
+#_ Stored metadata is zlib-compressed (zlib default level; higher levels barely shrink JSON further)
+METADATA_COMPRESS_LEVEL = 6
+
+#_ Bounds of the distilled search_text indexed in assets_fts (per string value and in total)
+SEARCH_STRING_MAX_CHARS = 200
+SEARCH_TEXT_MAX_CHARS = 16 * 1024
+
+#_ Quoted JSON strings (keys and values), for content that does not parse
+RE_QUOTED_STRING = re.compile(r'"((?:[^"\\\n]|\\.)+)"')
+
+#_ References to other assets: string values that look like a file path (with an extension), and
+#_ identifier-like values that may be another asset's internal id
+RE_PATH_REF = re.compile(r"^[\w\-. /\\]*[\w\-]\.[A-Za-z][A-Za-z0-9]{1,15}$")
+RE_ID_REF = re.compile(r"^[A-Za-z][\w\-:.]{1,99}$")
+
+#_ Candidate references kept per asset; longer string values are prose, not references
+ASSET_REFS_MAX = 2000
+ASSET_REF_MAX_CHARS = 256
+
+#_ Central directory entries handed to a worker process at once (amortizes pickling/IPC per task)
+ASSET_SHARD_ENTRIES = 256
+
+#_ Rows buffered before one executemany round-trip
+ASSET_WRITE_BATCH = 2000
+
+#_ ZipFile opened once per worker process by _init_worker (parsing the central directory is not free)
+_worker_zip: zipfile.ZipFile | None = None
+
+
 class AssetIndexer:
     """Indexes Hytale assets from Assets.zip without full extraction."""
 
@@ -65,19 +104,13 @@ class AssetIndexer:
         self.assets_zip_path = assets_zip_path
         self.version = version
 
-    def _determine_category(self, file_path: str) -> str | None:
-        p = Path(file_path)
-        #_ Check parents to find a match in CATEGORY_MAP (longest match priority)
-        #_ We normalize to posix for consistent mapping
-        posix_path = p.as_posix()
-        
-        #_ Try to find the most specific directory match
-        for folder, category in self.CATEGORY_MAP.items():
-            if posix_path.startswith(folder + "/"):
-                return category
-        return None
-
-    def _get_png_dimensions(self, data: bytes) -> tuple[int, int] | None:
+    @classmethod
+    def _determine_category(cls, file_path: str) -> str | None:
+        #_ Longest folder-prefix match (see AssetCategoryClassifier)
+        return CATEGORY_CLASSIFIER.classify(file_path)
+
+    @staticmethod
+    def _get_png_dimensions(data: bytes) -> tuple[int, int] | None:
         """Extracts width and height from PNG header (first 24 bytes)."""
         if len(data) < 24: return None
         if data[0:8] != b'\x89PNG\r\n\x1a\n': return None
@@ -88,80 +121,217 @@ class AssetIndexer:
         except Exception:
             return None
 
-    def run(self, progress_callback: Callable[[str, int, int], None] | None = None):
-        """Iterates over the ZIP and indexes relevant files."""
+    def run(
+        self,
+        progress_callback: Callable[[str, int, int], None] | None = None,
+        jobs: int | None = None,
+        rebuild: bool = False,
+    ) -> dict[str, int] | None:
+        """
+        Iterates over the ZIP and indexes relevant files.
+        Incremental: the central directory (CRC32, compressed and uncompressed size) is diffed against the
+        indexed assets and only added or changed entries are read; removed ones are deleted. rebuild=True
+        drops the tables and reads everything.
+        Entries are split into shards parsed by `jobs` worker processes (default: CPU count; 1 = sequential),
+        each with its own ZipFile handle; this process is the single batched DB writer.
+        Returns {"entries", "added", "changed", "removed"} (entries: files in the ZIP) or None if Assets.zip does not exist.
+        """
         if not self.assets_zip_path.exists():
-            return
+            return None
+        jobs = max(1, jobs if jobs is not None else (os.cpu_count() or 1))
 
         with zipfile.ZipFile(self.assets_zip_path, 'r') as z:
-            all_files = z.namelist()
-            total = len(all_files)
-            
             with db.connection(self.db_path) as conn:
-                db.init_assets_schema(conn)
-                
-                #_ Batch speed up
-                for i, file_path in enumerate(all_files):
-                    info = z.getinfo(file_path)
+                recreated = db.init_assets_schema(conn, rebuild=rebuild)
+                manifest = db.get_asset_manifest(conn)
+
+                entries = 0
+                names: list[str] = []
+                ids: dict[str, int] = {}
+                stale: list[int] = []
+                added = 0
+                next_id = db.next_asset_id(conn)
+                for info in z.infolist():
                     if info.is_dir():
                         continue
-                    
-                    ext = Path(file_path).suffix.lower()
-                    metadata = None
-                    category = self._determine_category(file_path)
-                    internal_id = None
-                    width = None
-                    height = None
-                    
-                    #_ Index metadata for JSON-like files
-                    if ext in ('.json', '.blockyanim', '.item', '.recipe', '.entity', '.particlespawner', '.particlesystem'):
-                        try:
-                            with z.open(file_path) as f:
-                                #_ Limit size to avoid memory issues with huge files
-                                raw = f.read(1024 * 512) # 512KB limit for metadata indexing
-                                content = raw.decode('utf-8', errors='ignore')
-                                metadata = content
-                                
-                                #_ Try to extract internal ID from JSON
-                                try:
-                                    #_ Fast extraction for common Hytale files
-                                    if '"id":' in content:
-                                        data = json.loads(content)
-                                        if isinstance(data, dict):
-                                            internal_id = data.get('id')
-                                            #_ If it's a block, it might have a group or type we want
-                                            if not category:
-                                                category = data.get('type')
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                    
-                    #_ For images, extract dimensions
-                    elif ext == '.png':
-                        try:
-                            with z.open(file_path) as f:
-                                header = f.read(24)
-                                dims = self._get_png_dimensions(header)
-                                if dims:
-                                    width, height = dims
-                        except Exception:
-                            pass
-                    
-                    db.insert_asset(
-                        conn,
-                        path=file_path,
-                        extension=ext,
-                        size=info.file_size,
-                        category=category,
-                        internal_id=internal_id,
-                        width=width,
-                        height=height,
-                        metadata=metadata,
-                        version=self.version
-                    )
-                    
-                    if progress_callback and i % 100 == 0:
-                        progress_callback(file_path, i, total)
-                
+                    entries += 1
+                    known = manifest.pop(info.filename, None)
+                    if known is not None:
+                        if known[1:] == (info.CRC, info.compress_size, info.file_size):
+                            continue
+                        #_ Changed entries keep their id
+                        stale.append(known[0])
+                        ids[info.filename] = known[0]
+                    else:
+                        added += 1
+                        ids[info.filename] = next_id
+                        next_id += 1
+                    names.append(info.filename)
+                #_ Whatever is left in the manifest is no longer in the ZIP
+                removed = [known[0] for known in manifest.values()]
+                db.delete_assets(conn, stale + removed)
+
+                total = len(names)
+                shards = [names[i:i + ASSET_SHARD_ENTRIES] for i in range(0, total, ASSET_SHARD_ENTRIES)]
+                done = 0
+                batch: list[tuple] = []
+                ref_rows: list[tuple[int, str, str]] = []
+                for records in _iter_shards(z, self.assets_zip_path, shards, jobs):
+                    for r in records:
+                        asset_id = ids[r[0]]
+                        batch.append((asset_id,) + r[:-1] + (self.version,))
+                        ref_rows.extend((asset_id, ref, kind) for ref, kind in r[-1])
+                    if len(batch) >= ASSET_WRITE_BATCH:
+                        db.insert_assets(conn, batch, ref_rows)
+                        batch.clear()
+                        ref_rows.clear()
+                    done += len(records)
+                    if progress_callback and records:
+                        progress_callback(records[-1][0], done, total)
+                if batch:
+                    db.insert_assets(conn, batch, ref_rows)
+
+                #_ Targets are resolved against the whole index: a changed asset can gain or lose referrers anywhere
+                if recreated or names or removed:
+                    db.resolve_asset_refs(conn)
                 conn.commit()
+        return {"entries": entries, "added": added, "changed": len(stale), "removed": len(removed)}
+
+
+#_ Built once from CATEGORY_MAP; shared with asset search filters
+CATEGORY_CLASSIFIER = AssetCategoryClassifier(AssetIndexer.CATEGORY_MAP)
+
+
+def _distill(data) -> tuple[list[str], list[str]]:
+    """
+    Walks a parsed JSON document depth-first. Returns (terms, values): keys and string values (truncated
+    to SEARCH_STRING_MAX_CHARS) for search_text, and the full string values for reference extraction,
+    both without duplicates.
+    """
+    terms: dict[str, None] = {}
+    values: dict[str, None] = {}
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                terms[key] = None
+                stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, str):
+            terms[node[:SEARCH_STRING_MAX_CHARS]] = None
+            values[node] = None
+    return list(terms), list(values)
+
+
+def _search_text(content: str, terms: list[str] | None) -> str:
+    """
+    Distilled, searchable projection of an asset's content: ids, keys, string values and referenced asset paths.
+    Content that is not valid JSON (or truncated) falls back to its quoted strings.
+    """
+    if terms is None:
+        terms = list(dict.fromkeys(s[:SEARCH_STRING_MAX_CHARS] for s in RE_QUOTED_STRING.findall(content)))
+    return "\n".join(terms)[:SEARCH_TEXT_MAX_CHARS]
+
+
+def _references(values: list[str], own_id) -> list[tuple[str, str]]:
+    """
+    Candidate references to other assets among the string values of a document: (ref, "path") for values
+    that look like a file path, (ref, "id") for identifier-like values (matched against internal ids).
+    They are resolved to asset ids after indexing (db.resolve_asset_refs).
+    """
+    refs = []
+    for value in values:
+        if len(value) > ASSET_REF_MAX_CHARS:
+            continue
+        if RE_PATH_REF.match(value):
+            refs.append((value, "path"))
+        elif value != own_id and RE_ID_REF.match(value):
+            refs.append((value, "id"))
+    return refs[:ASSET_REFS_MAX]
+
+
+def _read_entry(z: zipfile.ZipFile, info: zipfile.ZipInfo) -> tuple:
+    """
+    Parses one ZIP entry into a compact asset record:
+    (path, extension, size, crc, compress_size, category, internal_id, width, height, metadata, search_text, refs),
+    metadata being the zlib-compressed content, search_text its distilled projection (see _search_text) and
+    refs its candidate references to other assets (see _references).
+    """
+    file_path = info.filename
+    ext = Path(file_path).suffix.lower()
+    metadata = None
+    search_text = None
+    refs: list[tuple[str, str]] = []
+    category = AssetIndexer._determine_category(file_path)
+    internal_id = None
+    width = None
+    height = None
+
+    #_ Index metadata for JSON-like files
+    if ext in METADATA_EXTENSIONS:
+        try:
+            with z.open(info) as f:
+                raw = f.read(METADATA_MAX_BYTES)
+                content = raw.decode('utf-8', errors='ignore')
+                metadata = zlib.compress(content.encode('utf-8'), METADATA_COMPRESS_LEVEL)
+
+                data = None
+                try:
+                    data = json.loads(content)
+                except Exception:
+                    pass
+                #_ Try to extract internal ID from JSON
+                if isinstance(data, dict):
+                    internal_id = data.get('id')
+                    #_ If it's a block, it might have a group or type we want
+                    if not category:
+                        category = data.get('type')
+                terms = None
+                if isinstance(data, (dict, list)):
+                    terms, values = _distill(data)
+                    refs = _references(values, internal_id)
+                search_text = _search_text(content, terms)
+        except Exception:
+            pass
+
+    #_ For images, extract dimensions
+    elif ext == '.png':
+        try:
+            with z.open(info) as f:
+                dims = AssetIndexer._get_png_dimensions(f.read(24))
+                if dims:
+                    width, height = dims
+        except Exception:
+            pass
+
+    return (file_path, ext, info.file_size, info.CRC, info.compress_size, category, internal_id, width, height, metadata, search_text, refs)
+
+
+def _read_shard(z: zipfile.ZipFile, names: list[str]) -> list[tuple]:
+    """Parses a contiguous slice of the central directory (getinfo is a dict lookup)."""
+    return [_read_entry(z, z.getinfo(name)) for name in names]
+
+
+def _init_worker(zip_path: str) -> None:
+    global _worker_zip
+    _worker_zip = zipfile.ZipFile(zip_path, 'r')
+
+
+def _read_shard_in_worker(names: list[str]) -> list[tuple]:
+    return _read_shard(_worker_zip, names)
+
+
+def _iter_shards(z: zipfile.ZipFile, zip_path: Path, shards: list[list[str]], jobs: int) -> Iterator[list[tuple]]:
+    """
+    Yields the records of each shard in the same order as shards.
+    With jobs > 1 shards are parsed in a process pool; each worker opens Assets.zip once.
+    """
+    if jobs <= 1 or len(shards) < 2:
+        for names in shards:
+            yield _read_shard(z, names)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(str(zip_path),)) as pool:
+        #_ map() preserves input order, so asset ids are identical to a sequential run
+        yield from pool.map(_read_shard_in_worker, shards)
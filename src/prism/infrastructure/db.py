@@ -1,9 +1,15 @@
 # SQLite schema and FTS5 index for the Hytale API (classes and methods).
 
+import os
 import sqlite3
+import threading
+import uuid
+import zlib
 from contextlib import contextmanager
 from pathlib import Path
 
+from . import search_utils
+
 
 def get_connection(db_path: Path) -> sqlite3.Connection:
     """Internal use: opens connection to the database; creates file and directory if they don't exist.
@@ -27,15 +33,190 @@ def connection(db_path: Path):
         conn.close()
 
 
-def init_schema(conn: sqlite3.Connection) -> None:
+#_ Read-only connection pool (query side: MCP tools, CLI query)
+READ_POOL_MAX_IDLE = 4
+READ_MMAP_SIZE = 256 * 1024 * 1024
+#_ Negative cache_size = KiB
+READ_CACHE_SIZE_KIB = 64 * 1024
+READ_CACHED_STATEMENTS = 256
+
+
+@contextmanager
+def attached(conn: sqlite3.Connection, db_path: Path, alias: str):
+    """
+    Context manager: ATTACHes another DB file under alias (e.g. the API DB next to the assets DB) so one
+    query can join both, and DETACHes it on exit. The caller checks that the file exists (ATTACH would create it).
+    """
+    uri = f"{db_path.resolve().as_uri()}?mode=ro"
+    conn.execute(f"ATTACH DATABASE ? AS {alias}", (uri,))
+    try:
+        yield conn
+    finally:
+        conn.execute(f"DETACH DATABASE {alias}")
+
+
+def _file_identity(db_path: Path) -> tuple[int, int] | None:
+    """(st_dev, st_ino) of the DB file; changes when the file is deleted and recreated."""
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ReadConnectionPool:
+    """
+    Thread-safe pool of read-only connections to one DB file. Connections are opened with a
+    mode=ro URI (no directory/file creation), tuned pragmas and a larger prepared-statement cache,
+    and reused across calls. If the file is replaced (different inode), idle connections are dropped.
+    """
+
+    def __init__(self, db_path: Path, max_idle: int = READ_POOL_MAX_IDLE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: list[sqlite3.Connection] = []
+        self._identity: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri, uri=True, check_same_thread=False, cached_statements=READ_CACHED_STATEMENTS
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {READ_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{READ_CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _drop_idle(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+    @contextmanager
+    def acquire(self):
+        identity = _file_identity(self.db_path)
+        conn = None
+        with self._lock:
+            if identity != self._identity:
+                self._drop_idle()
+                self._identity = identity
+            if self._idle:
+                conn = self._idle.pop()
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                if identity == self._identity and len(self._idle) < self.max_idle:
+                    self._idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop_idle()
+            self._identity = None
+
+
+_read_pools: dict[str, ReadConnectionPool] = {}
+_read_pools_lock = threading.Lock()
+
+
+@contextmanager
+def read_connection(db_path: Path):
+    """
+    Context manager: borrows a pooled read-only connection for db_path and returns it on exit.
+    Raises sqlite3.OperationalError if the DB file does not exist.
+    Usage: with db.read_connection(db_path) as conn: ...
+    """
+    key = str(db_path)
+    with _read_pools_lock:
+        pool = _read_pools.get(key)
+        if pool is None:
+            pool = _read_pools[key] = ReadConnectionPool(db_path)
+    with pool.acquire() as conn:
+        yield conn
+
+
+def close_read_pools() -> None:
+    """Closes every idle pooled read connection."""
+    with _read_pools_lock:
+        for pool in _read_pools.values():
+            pool.close()
+        _read_pools.clear()
+
+
+#_ Bump when the API schema changes: a DB with another user_version is rebuilt from scratch
+SCHEMA_VERSION = 8
+
+#_ Same rule for the assets DB (a separate file, so it has its own user_version)
+ASSETS_SCHEMA_VERSION = 6
+
+
+def _ensure_meta(conn: sqlite3.Connection) -> None:
     """
-    Creates normal tables (classes, methods) and the FTS5 virtual table for searching.
-    Drops and recreates tables to ensure schema synchronization.
+    Key/value table that survives rebuilds. Holds index_id (random, created with the table) and
+    generation (bumped by every index run that changes rows), used to invalidate result caches.
     """
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('index_id', ?)", (uuid.uuid4().hex,)
+    )
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')")
+
+
+def bump_generation(conn: sqlite3.Connection) -> None:
+    """Marks the index as changed (call inside the indexing transaction)."""
+    _ensure_meta(conn)
+    conn.execute(
+        "UPDATE meta SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) WHERE key = 'generation'"
+    )
+
+
+def get_generation(conn: sqlite3.Connection) -> str | None:
+    """'<index_id>:<generation>', unique per index content; None if the DB has no meta table."""
+    try:
+        rows = conn.execute(
+            "SELECT key, value FROM meta WHERE key IN ('index_id', 'generation')"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    values = {r["key"]: r["value"] for r in rows}
+    if "index_id" not in values or "generation" not in values:
+        return None
+    return f"{values['index_id']}:{values['generation']}"
+
+
+def init_schema(conn: sqlite3.Connection, rebuild: bool = False) -> bool:
+    """
+    Ensures the API schema: classes (with their files), methods, constants, the files manifest, the identifier index,
+    the call graph, supertypes with their closure, the symbols view and the FTS5 table over it.
+    Tables are dropped and recreated if rebuild is True or the DB has another SCHEMA_VERSION;
+    otherwise existing rows are kept for incremental indexing. Returns True if the tables were recreated.
+    """
+    _ensure_meta(conn)
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    if current == SCHEMA_VERSION and not rebuild:
+        return False
+
     conn.execute("DROP TABLE IF EXISTS api_fts")
+    conn.execute("DROP VIEW IF EXISTS symbols")
+    conn.execute("DROP TABLE IF EXISTS identifier_postings")
+    conn.execute("DROP TABLE IF EXISTS identifiers")
+    conn.execute("DROP TABLE IF EXISTS call_edges")
+    conn.execute("DROP TABLE IF EXISTS type_closure")
+    conn.execute("DROP TABLE IF EXISTS supertypes")
     conn.execute("DROP TABLE IF EXISTS methods")
     conn.execute("DROP TABLE IF EXISTS constants")
     conn.execute("DROP TABLE IF EXISTS classes")
+    conn.execute("DROP TABLE IF EXISTS class_files")
+    conn.execute("DROP TABLE IF EXISTS files")
     
     conn.execute("""
         CREATE TABLE classes (
@@ -46,6 +227,7 @@ def init_schema(conn: sqlite3.Connection) -> None:
             file_path TEXT NOT NULL,
             parent TEXT,
             interfaces TEXT,
+            tokens TEXT,
             UNIQUE(package, class_name)
         )
     """)
@@ -58,6 +240,8 @@ def init_schema(conn: sqlite3.Connection) -> None:
             params TEXT NOT NULL,
             is_static INTEGER NOT NULL DEFAULT 0,
             annotation TEXT,
+            snippet TEXT,
+            tokens TEXT,
             FOREIGN KEY (class_id) REFERENCES classes(id)
         )
     """)
@@ -68,13 +252,106 @@ def init_schema(conn: sqlite3.Connection) -> None:
             name TEXT NOT NULL,
             type TEXT NOT NULL,
             value TEXT NOT NULL,
+            snippet TEXT,
+            tokens TEXT,
             FOREIGN KEY (class_id) REFERENCES classes(id)
         )
     """)
+    #_ Manifest of indexed source files: a file is re-extracted only when its content hash changes
+    conn.execute("""
+        CREATE TABLE files (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            digest TEXT NOT NULL
+        )
+    """)
+    #_ Identifier inverted index (find_usages): identifier -> files -> line numbers
+    conn.execute("""
+        CREATE TABLE identifiers (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE identifier_postings (
+            identifier_id INTEGER NOT NULL,
+            file_id INTEGER NOT NULL,
+            lines TEXT NOT NULL,
+            PRIMARY KEY (identifier_id, file_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_identifier_postings_file_id ON identifier_postings(file_id)")
+    #_ Files declaring each class: usually one, several for a nested type whose simple name repeats in a package
+    conn.execute("""
+        CREATE TABLE class_files (
+            file_id INTEGER NOT NULL,
+            class_id INTEGER NOT NULL,
+            PRIMARY KEY (file_id, class_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_class_files_class_id ON class_files(class_id)")
+    #_ Call graph: one row per call site in a method body (callee by name + receiver class hint)
+    conn.execute("""
+        CREATE TABLE call_edges (
+            caller_class_id INTEGER NOT NULL,
+            caller_method TEXT NOT NULL,
+            callee TEXT NOT NULL,
+            receiver_type TEXT,
+            line INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_call_edges_callee ON call_edges(callee, receiver_type)")
+    conn.execute("CREATE INDEX idx_call_edges_caller ON call_edges(caller_class_id, caller_method)")
+    #_ Declared supertypes (simple name + package candidates from imports); super_id is set by rebuild_type_closure
+    conn.execute("""
+        CREATE TABLE supertypes (
+            class_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            packages TEXT NOT NULL,
+            via_extends INTEGER NOT NULL,
+            super_id INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX idx_supertypes_class_id ON supertypes(class_id)")
+    conn.execute("CREATE INDEX idx_supertypes_name ON supertypes(name)")
+    #_ Transitive closure of resolved supertypes: shortest depth, via_extends = reachable through extends only
+    conn.execute("""
+        CREATE TABLE type_closure (
+            descendant_id INTEGER NOT NULL,
+            ancestor_id INTEGER NOT NULL,
+            depth INTEGER NOT NULL,
+            via_extends INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_type_closure_descendant ON type_closure(descendant_id, depth)")
     conn.execute("CREATE INDEX idx_methods_class_id ON methods(class_id)")
     conn.execute("CREATE INDEX idx_constants_class_id ON constants(class_id)")
     conn.execute("CREATE INDEX idx_classes_package ON classes(package)")
 
+    #_ Every class, method and constant as one searchable row. Ids share one sequence (BatchWriter), so a
+    #_ symbol id identifies the row and its table; the class snippet is derived instead of stored.
+    #_ tokens: camel-case sub-words of the symbol name (search_utils.identifier_subtokens)
+    conn.execute("""
+        CREATE VIEW symbols AS
+        SELECT c.id AS id, c.id AS class_id, c.package, c.class_name, c.kind,
+               NULL AS method_name, NULL AS returns, NULL AS params, NULL AS const_name, NULL AS const_value,
+               'public ' || c.kind || ' ' || c.class_name AS snippet, c.tokens
+        FROM classes c
+        UNION ALL
+        SELECT m.id, m.class_id, c.package, c.class_name, c.kind,
+               m.method, m.returns, m.params, NULL, NULL, m.snippet, m.tokens
+        FROM methods m JOIN classes c ON c.id = m.class_id
+        UNION ALL
+        SELECT k.id, k.class_id, c.package, c.class_name, c.kind,
+               NULL, NULL, NULL, k.name, k.value, k.snippet, k.tokens
+        FROM constants k JOIN classes c ON c.id = k.class_id
+    """)
+    #_ External content: api_fts stores only the index, rowid = symbol id (rows are written by BatchWriter).
+    #_ No prefix= indexes: term* is a range scan of the term b-tree, as fast here for the sub-word prefixes
+    #_ of expand_identifier_terms while keeping the index a third smaller
     conn.execute("""
         CREATE VIRTUAL TABLE api_fts USING fts5(
             package,
@@ -86,17 +363,32 @@ def init_schema(conn: sqlite3.Connection) -> None:
             const_name,
             const_value,
             snippet,
+            tokens,
+            content='symbols',
+            content_rowid='id',
             tokenize='unicode61'
         )
     """)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
+    return True
 
 
-def init_assets_schema(conn: sqlite3.Connection) -> None:
+def init_assets_schema(conn: sqlite3.Connection, rebuild: bool = False) -> bool:
     """
-    Creates tables for assets (metadata and FTS).
+    Ensures tables for assets (metadata and FTS). Each asset keeps the CRC32 and compressed size of its
+    ZIP entry so that re-runs only re-read entries that changed. metadata holds the zlib-compressed content
+    (see decode_asset_metadata); only the distilled search_text is indexed. asset_refs holds the reference graph,
+    asset_code_links the classes that load each category. Tables are dropped and recreated if
+    rebuild is True or the DB has another ASSETS_SCHEMA_VERSION. Returns True if the tables were recreated.
     """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    if current == ASSETS_SCHEMA_VERSION and not rebuild:
+        return False
+
     conn.execute("DROP TABLE IF EXISTS assets_fts")
+    conn.execute("DROP TABLE IF EXISTS asset_refs")
+    conn.execute("DROP TABLE IF EXISTS asset_code_links")
     conn.execute("DROP TABLE IF EXISTS assets")
     
     conn.execute("""
@@ -105,106 +397,587 @@ def init_assets_schema(conn: sqlite3.Connection) -> None:
             path TEXT NOT NULL UNIQUE,
             extension TEXT NOT NULL,
             size INTEGER NOT NULL,
+            crc INTEGER NOT NULL,
+            compress_size INTEGER NOT NULL,
             category TEXT,
             internal_id TEXT,
             width INTEGER,
             height INTEGER,
-            metadata TEXT,
+            metadata BLOB,
+            search_text TEXT,
             version TEXT NOT NULL
         )
     """)
     
+    #_ Reference graph: ref is the raw string found in the source asset (a path or an internal id),
+    #_ target_id the asset it resolves to (NULL if none or ambiguous; see resolve_asset_refs)
+    conn.execute("""
+        CREATE TABLE asset_refs (
+            source_id INTEGER NOT NULL,
+            ref TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            target_id INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX idx_asset_refs_source ON asset_refs(source_id, target_id)")
+    conn.execute("CREATE INDEX idx_asset_refs_target ON asset_refs(target_id, source_id)")
+    conn.execute("CREATE INDEX idx_assets_internal_id ON assets(internal_id)")
+    #_ Asset category <-> API class (package, class_name in the API DB); see asset_links.build_asset_code_links
+    conn.execute("""
+        CREATE TABLE asset_code_links (
+            category TEXT NOT NULL,
+            folder TEXT NOT NULL,
+            package TEXT NOT NULL,
+            class_name TEXT NOT NULL,
+            evidence TEXT NOT NULL,
+            PRIMARY KEY (category, package, class_name, evidence)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_asset_code_links_class ON asset_code_links(class_name, package)")
+    #_ B-tree indexes for search filters (cat:, ext:, w/h, size); FTS only handles free text
+    conn.execute("CREATE INDEX idx_assets_category ON assets(category)")
+    conn.execute("CREATE INDEX idx_assets_extension ON assets(extension)")
+    conn.execute("CREATE INDEX idx_assets_size ON assets(size)")
+    conn.execute("CREATE INDEX idx_assets_dimensions ON assets(width, height)")
+    conn.execute("CREATE INDEX idx_assets_height ON assets(height)")
+
+    #_ External-content FTS: the index reads column values from assets (rowid = assets.id) instead of
+    #_ keeping its own copy. insert_assets/delete_assets keep it in sync (batched, cheaper than triggers)
     conn.execute("""
         CREATE VIRTUAL TABLE assets_fts USING fts5(
             path,
             category,
             internal_id,
-            metadata,
+            search_text,
+            content='assets',
+            content_rowid='id',
             tokenize='trigram'
         )
     """)
+    conn.execute(f"PRAGMA user_version = {ASSETS_SCHEMA_VERSION}")
     conn.commit()
+    return True
 
 
-def clear_tables(conn: sqlite3.Connection) -> None:
-    """Empties data tables (classes, methods, constants, api_fts) to reindex from scratch."""
-    conn.execute("DELETE FROM api_fts")
-    conn.execute("DELETE FROM methods")
-    conn.execute("DELETE FROM constants")
-    conn.execute("DELETE FROM classes")
-    conn.commit()
+def get_asset_manifest(conn: sqlite3.Connection) -> dict[str, tuple[int, int, int, int]]:
+    """Returns {path: (id, crc, compress_size, size)} for every indexed asset."""
+    return {
+        r["path"]: (r["id"], r["crc"], r["compress_size"], r["size"])
+        for r in conn.execute("SELECT id, path, crc, compress_size, size FROM assets")
+    }
 
 
-def insert_class(conn: sqlite3.Connection, package: str, class_name: str, kind: str, file_path: str, parent: str | None = None, interfaces: str | None = None) -> int:
-    """Inserts a class and returns its id. If (package, class_name) exists, returns the existing id."""
-    cur = conn.execute(
-        "INSERT OR IGNORE INTO classes (package, class_name, kind, file_path, parent, interfaces) VALUES (?, ?, ?, ?, ?, ?)",
-        (package, class_name, kind, file_path, parent, interfaces),
+def delete_assets(conn: sqlite3.Connection, asset_ids: list[int]) -> None:
+    """Removes assets with their FTS entries and outgoing references by id (incoming ones are re-resolved later)."""
+    params = [(i,) for i in asset_ids]
+    conn.executemany("DELETE FROM asset_refs WHERE source_id = ?", params)
+    #_ An external-content FTS row is removed with the 'delete' command and the values it was indexed with
+    conn.executemany(
+        """INSERT INTO assets_fts (assets_fts, rowid, path, category, internal_id, search_text)
+           SELECT 'delete', id, path, category, internal_id, search_text FROM assets WHERE id = ?""",
+        params
     )
-    if cur.lastrowid and cur.lastrowid > 0:
-        return cur.lastrowid
+    conn.executemany("DELETE FROM assets WHERE id = ?", params)
 
-    # If already exists, we might need to update parent/interfaces if they were NULL before
-    # (e.g. if we indexed a reference before the actual definition)
-    conn.execute(
-        "UPDATE classes SET parent = ?, interfaces = ?, kind = ?, file_path = ? WHERE package = ? AND class_name = ?",
-        (parent, interfaces, kind, file_path, package, class_name)
-    )
-    
-    row = conn.execute(
-        "SELECT id FROM classes WHERE package = ? AND class_name = ?",
-        (package, class_name),
-    ).fetchone()
-    return row["id"] if row else 0
+
+def get_file_manifest(conn: sqlite3.Connection) -> dict[str, dict]:
+    """Returns {path: {"id", "size", "mtime_ns", "digest"}} for every indexed source file."""
+    return {
+        r["path"]: {"id": r["id"], "size": r["size"], "mtime_ns": r["mtime_ns"], "digest": r["digest"]}
+        for r in conn.execute("SELECT id, path, size, mtime_ns, digest FROM files")
+    }
+
+
+def touch_files(conn: sqlite3.Connection, rows: list[tuple[int, int, str]]) -> None:
+    """Updates size/mtime of files whose content hash did not change. rows: (size, mtime_ns, path)."""
+    conn.executemany("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", rows)
 
 
-def insert_constant(
+def get_shared_class_files(
     conn: sqlite3.Connection,
-    class_id: int,
-    name: str,
-    type_name: str,
-    value: str,
-) -> None:
-    """Inserts a constant."""
-    conn.execute(
-        "INSERT INTO constants (class_id, name, type, value) VALUES (?, ?, ?, ?)",
-        (class_id, name, type_name, value),
+    file_paths: list[str] = (),
+    class_ids: list[int] = (),
+) -> list[str]:
+    """
+    Paths of the indexed files that declare a class together with one of file_paths, or declare one of
+    class_ids, transitively (indexed file_paths included), ordered by path. A class row is shared when
+    two files of a package declare a nested type with the same simple name; delete_file_rows needs all
+    of its files, so that the class is rebuilt whole from them.
+    """
+    file_ids: set[int] = set()
+    for file_path in file_paths:
+        row = conn.execute("SELECT id FROM files WHERE path = ?", (file_path,)).fetchone()
+        if row:
+            file_ids.add(row["id"])
+    frontier = set(file_ids)
+    pending = set(class_ids)
+    seen_classes: set[int] = set()
+    while frontier or pending:
+        for file_id in frontier:
+            pending.update(r["class_id"] for r in conn.execute("SELECT class_id FROM class_files WHERE file_id = ?", (file_id,)))
+        frontier = set()
+        for class_id in pending - seen_classes:
+            seen_classes.add(class_id)
+            for r in conn.execute("SELECT file_id FROM class_files WHERE class_id = ?", (class_id,)):
+                if r["file_id"] not in file_ids:
+                    file_ids.add(r["file_id"])
+                    frontier.add(r["file_id"])
+        pending = set()
+    return sorted(
+        r["path"] for file_id in file_ids for r in conn.execute("SELECT path FROM files WHERE id = ?", (file_id,))
     )
 
 
-def insert_method(
-    conn: sqlite3.Connection,
-    class_id: int,
-    method: str,
-    returns: str,
-    params: str,
-    is_static: bool,
-    annotation: str | None,
-) -> None:
-    """Inserts a method."""
+def delete_file_rows(conn: sqlite3.Connection, file_paths: list[str], drop_manifest: bool = False) -> None:
+    """
+    Removes the classes of the given source files with their methods, constants, call edges, supertypes,
+    FTS rows and identifier postings (type_closure is recomputed afterwards by rebuild_type_closure).
+    A class goes with all its rows, so every file that declares it must be listed (see get_shared_class_files).
+    FTS entries are removed with the 'delete' command, fed from the symbols view before the rows go away.
+    drop_manifest also removes the files' manifest entries (for deleted files).
+    """
+    for file_path in file_paths:
+        row = conn.execute("SELECT id FROM files WHERE path = ?", (file_path,)).fetchone()
+        if not row:
+            continue
+        conn.execute("DELETE FROM identifier_postings WHERE file_id = ?", (row["id"],))
+        class_ids = [(r["class_id"],) for r in conn.execute("SELECT class_id FROM class_files WHERE file_id = ?", (row["id"],))]
+        conn.executemany(
+            """INSERT INTO api_fts (api_fts, rowid, package, class_name, kind, method_name, returns, params, const_name, const_value, snippet, tokens)
+               SELECT 'delete', id, package, class_name, kind, method_name, returns, params, const_name, const_value, snippet, tokens
+               FROM symbols WHERE class_id = ?""",
+            class_ids,
+        )
+        conn.executemany("DELETE FROM methods WHERE class_id = ?", class_ids)
+        conn.executemany("DELETE FROM constants WHERE class_id = ?", class_ids)
+        conn.executemany("DELETE FROM call_edges WHERE caller_class_id = ?", class_ids)
+        conn.executemany("DELETE FROM supertypes WHERE class_id = ?", class_ids)
+        conn.executemany("DELETE FROM classes WHERE id = ?", class_ids)
+        conn.executemany("DELETE FROM class_files WHERE class_id = ?", class_ids)
+        if drop_manifest:
+            conn.execute("DELETE FROM files WHERE id = ?", (row["id"],))
+
+
+#_ Buffered rows (all tables together) before BatchWriter flushes with executemany
+WRITER_BATCH_ROWS = 5000
+
+
+class BatchWriter:
+    """
+    Buffers file, class (with the files declaring it), supertype, method, constant, call edge, FTS and identifier posting rows and writes them with executemany.
+    File, symbol (class, method, constant) and identifier ids are assigned in Python, so rows can reference
+    them before they reach SQLite. Classes, methods and constants draw from one id sequence: the id of an
+    api_fts row is the id of its symbol. Call flush() before committing.
+    reused_class_ids: classes that existed before this writer and were declared again (by a file added
+    since, as the files of existing classes are deleted before they are re-extracted).
+    Usage: writer = db.BatchWriter(conn); writer.add_file(...); class_id = writer.add_class(...); ...; writer.flush()
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batch_rows: int = WRITER_BATCH_ROWS):
+        self.conn = conn
+        self.batch_rows = batch_rows
+        #_ class_id -> (package, class_name, kind) of every class, for the FTS rows of its members.
+        #_ Existing classes keep their ids (incremental runs write on top of previous data)
+        self._class_keys: dict[int, tuple[str, str, str]] = {}
+        self._class_ids: dict[tuple[str, str], int] = {}
+        for r in conn.execute("SELECT id, package, class_name, kind FROM classes"):
+            self._class_keys[r["id"]] = (r["package"], r["class_name"], r["kind"])
+            self._class_ids[(r["package"], r["class_name"])] = r["id"]
+        self._existing_class_ids = set(self._class_keys)
+        self.reused_class_ids: set[int] = set()
+        self._next_symbol_id = 1 + conn.execute(
+            """SELECT MAX(COALESCE((SELECT MAX(id) FROM classes), 0),
+                          COALESCE((SELECT MAX(id) FROM methods), 0),
+                          COALESCE((SELECT MAX(id) FROM constants), 0))"""
+        ).fetchone()[0]
+        self._file_ids: dict[str, int] = {r["path"]: r["id"] for r in conn.execute("SELECT id, path FROM files")}
+        self._next_file_id = max(self._file_ids.values(), default=0) + 1
+        self._identifier_ids: dict[str, int] = {
+            r["name"]: r["id"] for r in conn.execute("SELECT id, name FROM identifiers")
+        }
+        self._next_identifier_id = max(self._identifier_ids.values(), default=0) + 1
+        self._files: list[tuple] = []
+        self._identifiers: list[tuple] = []
+        self._postings: list[tuple] = []
+        self._classes: list[tuple] = []
+        self._class_files: list[tuple] = []
+        self._methods: list[tuple] = []
+        self._constants: list[tuple] = []
+        self._calls: list[tuple] = []
+        self._supertypes: list[tuple] = []
+        self._fts: list[tuple] = []
+        self._pending = 0
+
+    def add_file(self, path: str, size: int, mtime_ns: int, digest: str) -> int:
+        """Queues the manifest entry of an indexed source file (insert or update by path) and returns its id."""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            file_id = self._next_file_id
+            self._next_file_id += 1
+            self._file_ids[path] = file_id
+        self._files.append((file_id, path, size, mtime_ns, digest))
+        self._added()
+        return file_id
+
+    def add_postings(self, file_id: int, postings: dict[str, str]) -> None:
+        """Queues the identifier postings of a file. postings: {identifier: "line,line,..."}."""
+        for name, lines in postings.items():
+            identifier_id = self._identifier_ids.get(name)
+            if identifier_id is None:
+                identifier_id = self._next_identifier_id
+                self._next_identifier_id += 1
+                self._identifier_ids[name] = identifier_id
+                self._identifiers.append((identifier_id, name))
+            self._postings.append((identifier_id, file_id, lines))
+        self._pending += len(postings)
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def add_class(
+        self,
+        package: str,
+        class_name: str,
+        kind: str,
+        file_path: str,
+        parent: str | None = None,
+        interfaces: str | None = None,
+    ) -> int:
+        """
+        Queues a class (and its FTS row) and returns its id. A repeated (package, class_name), e.g. a nested
+        type declared in two files of a package, keeps the id and attributes of its first declaration: the
+        kind is part of every FTS row of the class, so it must not change under rows already indexed.
+        file_path must come from add_file in this run (class_files records every declaring file).
+        """
+        key = (package, class_name)
+        class_id = self._class_ids.get(key)
+        if class_id is not None:
+            self._class_files.append((self._file_ids[file_path], class_id))
+            if class_id in self._existing_class_ids:
+                self.reused_class_ids.add(class_id)
+            self._added()
+            return class_id
+        class_id = self._take_symbol_id()
+        tokens = search_utils.identifier_subtokens(class_name)
+        self._class_ids[key] = class_id
+        self._class_keys[class_id] = (package, class_name, kind)
+        self._classes.append((class_id, package, class_name, kind, file_path, parent, interfaces, tokens))
+        self._class_files.append((self._file_ids[file_path], class_id))
+        self._fts.append((class_id, package, class_name, kind, None, None, None, None, None, f"public {kind} {class_name}", tokens))
+        self._added()
+        return class_id
+
+    def _take_symbol_id(self) -> int:
+        symbol_id = self._next_symbol_id
+        self._next_symbol_id += 1
+        return symbol_id
+
+    def add_method(
+        self,
+        class_id: int,
+        method: str,
+        returns: str,
+        params: str,
+        is_static: bool,
+        annotation: str | None,
+        snippet: str | None = None,
+    ) -> None:
+        """Queues a method with its FTS row. class_id must come from add_class in this run."""
+        method_id = self._take_symbol_id()
+        package, class_name, kind = self._class_keys[class_id]
+        tokens = search_utils.identifier_subtokens(method)
+        self._methods.append((method_id, class_id, method, returns, params, 1 if is_static else 0, annotation, snippet, tokens))
+        self._fts.append((method_id, package, class_name, kind, method, returns, params, None, None, snippet, tokens))
+        self._added()
+
+    def add_constant(self, class_id: int, name: str, type_name: str, value: str, snippet: str | None = None) -> None:
+        """Queues a constant with its FTS row. class_id must come from add_class in this run."""
+        constant_id = self._take_symbol_id()
+        package, class_name, kind = self._class_keys[class_id]
+        tokens = search_utils.identifier_subtokens(name)
+        self._constants.append((constant_id, class_id, name, type_name, value, snippet, tokens))
+        self._fts.append((constant_id, package, class_name, kind, None, None, None, name, value, snippet, tokens))
+        self._added()
+
+    def add_supertypes(self, class_id: int, refs: list[tuple[str, str, bool]]) -> None:
+        """Queues the declared supertypes of a class. refs: (simple_name, "pkg1,pkg2", via_extends)."""
+        self._supertypes.extend((class_id, name, packages, 1 if via_extends else 0) for name, packages, via_extends in refs)
+        self._pending += len(refs)
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def add_calls(self, class_id: int, method: str, calls: list[tuple[str, str | None, int]]) -> None:
+        """Queues the call edges of a method. calls: (callee, receiver_type, line)."""
+        self._calls.extend((class_id, method, callee, receiver_type, line) for callee, receiver_type, line in calls)
+        self._pending += len(calls)
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def _added(self) -> None:
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes every buffered row (classes first, so ids exist before rows that point to them)."""
+        if self._files:
+            self.conn.executemany(
+                """INSERT INTO files (id, path, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, digest = excluded.digest""",
+                self._files,
+            )
+        if self._identifiers:
+            self.conn.executemany("INSERT INTO identifiers (id, name) VALUES (?, ?)", self._identifiers)
+        if self._postings:
+            #_ OR REPLACE: a file listed twice in one run keeps its latest postings
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO identifier_postings (identifier_id, file_id, lines) VALUES (?, ?, ?)",
+                self._postings,
+            )
+        if self._classes:
+            self.conn.executemany(
+                "INSERT INTO classes (id, package, class_name, kind, file_path, parent, interfaces, tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._classes,
+            )
+        if self._class_files:
+            #_ OR IGNORE: a file may declare the same nested name twice
+            self.conn.executemany("INSERT OR IGNORE INTO class_files (file_id, class_id) VALUES (?, ?)", self._class_files)
+        if self._methods:
+            self.conn.executemany(
+                "INSERT INTO methods (id, class_id, method, returns, params, is_static, annotation, snippet, tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._methods,
+            )
+        if self._constants:
+            self.conn.executemany(
+                "INSERT INTO constants (id, class_id, name, type, value, snippet, tokens) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._constants,
+            )
+        if self._supertypes:
+            self.conn.executemany(
+                "INSERT INTO supertypes (class_id, name, packages, via_extends) VALUES (?, ?, ?, ?)",
+                self._supertypes,
+            )
+        if self._calls:
+            self.conn.executemany(
+                "INSERT INTO call_edges (caller_class_id, caller_method, callee, receiver_type, line) VALUES (?, ?, ?, ?, ?)",
+                self._calls,
+            )
+        if self._fts:
+            self.conn.executemany(
+                "INSERT INTO api_fts (rowid, package, class_name, kind, method_name, returns, params, const_name, const_value, snippet, tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._fts,
+            )
+        self._files.clear()
+        self._identifiers.clear()
+        self._postings.clear()
+        self._classes.clear()
+        self._class_files.clear()
+        self._methods.clear()
+        self._constants.clear()
+        self._calls.clear()
+        self._supertypes.clear()
+        self._fts.clear()
+        self._pending = 0
+
+
+def get_identifier_postings(conn: sqlite3.Connection, name: str) -> list[dict] | None:
+    """
+    Returns [{"file_path", "lines": [int, ...]}] for an identifier, ordered by file path; lines keep
+    one entry per occurrence. Returns None if the DB has no identifier index (built before it existed).
+    """
+    try:
+        rows = conn.execute(
+            """SELECT f.path, p.lines
+               FROM identifiers i
+               JOIN identifier_postings p ON p.identifier_id = i.id
+               JOIN files f ON f.id = p.file_id
+               WHERE i.name = ?
+               ORDER BY f.path""",
+            (name,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [{"file_path": r["path"], "lines": [int(n) for n in r["lines"].split(",")]} for r in rows]
+
+
+#_ Longest supertype chain followed when building the closure (guards against cycles in broken code)
+TYPE_CLOSURE_MAX_DEPTH = 64
+
+
+def rebuild_type_closure(conn: sqlite3.Connection) -> None:
+    """
+    Resolves every supertypes row to a class id (first package candidate that has the class, else the
+    only indexed class with that simple name) and recomputes type_closure with a recursive query.
+    """
+    class_ids: dict[tuple[str, str], int] = {}
+    ids_by_name: dict[str, list[int]] = {}
+    for r in conn.execute("SELECT id, package, class_name FROM classes"):
+        class_ids[(r["package"], r["class_name"])] = r["id"]
+        ids_by_name.setdefault(r["class_name"], []).append(r["id"])
+
+    updates: list[tuple[int | None, int]] = []
+    for r in conn.execute("SELECT rowid, class_id, name, packages, super_id FROM supertypes").fetchall():
+        super_id = None
+        for package in r["packages"].split(","):
+            super_id = class_ids.get((package, r["name"]))
+            if super_id is not None:
+                break
+        if super_id is None and len(ids_by_name.get(r["name"], ())) == 1:
+            super_id = ids_by_name[r["name"]][0]
+        if super_id == r["class_id"]:
+            super_id = None
+        if super_id != r["super_id"]:
+            updates.append((super_id, r["rowid"]))
+    conn.executemany("UPDATE supertypes SET super_id = ? WHERE rowid = ?", updates)
+
+    conn.execute("DELETE FROM type_closure")
     conn.execute(
-        "INSERT INTO methods (class_id, method, returns, params, is_static, annotation) VALUES (?, ?, ?, ?, ?, ?)",
-        (class_id, method, returns, params, 1 if is_static else 0, annotation),
+        """INSERT INTO type_closure (descendant_id, ancestor_id, depth, via_extends)
+           WITH RECURSIVE walk(descendant_id, ancestor_id, depth, via_extends) AS (
+               SELECT class_id, super_id, 1, via_extends FROM supertypes WHERE super_id IS NOT NULL
+               UNION
+               SELECT w.descendant_id, s.super_id, w.depth + 1, w.via_extends AND s.via_extends
+               FROM walk w JOIN supertypes s ON s.class_id = w.ancestor_id
+               WHERE s.super_id IS NOT NULL AND w.depth < ?
+           )
+           SELECT descendant_id, ancestor_id, MIN(depth), MAX(via_extends)
+           FROM walk WHERE descendant_id != ancestor_id
+           GROUP BY descendant_id, ancestor_id""",
+        (TYPE_CLOSURE_MAX_DEPTH,),
     )
 
 
-def insert_fts_row(
+def get_class_row(conn: sqlite3.Connection, package: str, class_name: str) -> dict | None:
+    """Class row only (no methods/constants): id, package, class_name, kind, file_path, parent, interfaces."""
+    row = conn.execute(
+        "SELECT id, package, class_name, kind, file_path, parent, interfaces FROM classes WHERE package = ? AND class_name = ?",
+        (package.strip(), class_name.strip()),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_ancestors(conn: sqlite3.Connection, class_id: int) -> list[dict] | None:
+    """
+    Every resolved supertype of a class ordered by depth: [{"id", "package", "class_name", "kind", "depth", "via_extends"}].
+    None if the DB has no type_closure table.
+    """
+    try:
+        rows = conn.execute(
+            """SELECT c.id, c.package, c.class_name, c.kind, t.depth, t.via_extends
+               FROM type_closure t JOIN classes c ON c.id = t.ancestor_id
+               WHERE t.descendant_id = ?
+               ORDER BY t.depth, c.package, c.class_name""",
+            (class_id,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [
+        {
+            "id": r["id"],
+            "package": r["package"],
+            "class_name": r["class_name"],
+            "kind": r["kind"],
+            "depth": r["depth"],
+            "via_extends": bool(r["via_extends"]),
+        }
+        for r in rows
+    ]
+
+
+def get_unresolved_supertypes(conn: sqlite3.Connection, class_ids: list[int]) -> list[dict]:
+    """Declared supertypes of the given classes that are not in the index: [{"class_id", "name", "packages", "via_extends"}]."""
+    if not class_ids:
+        return []
+    marks = ",".join("?" * len(class_ids))
+    rows = conn.execute(
+        f"SELECT class_id, name, packages, via_extends FROM supertypes WHERE super_id IS NULL AND class_id IN ({marks})",
+        class_ids,
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_callers(conn: sqlite3.Connection, class_name: str, method_name: str, limit: int = 200) -> list[dict] | None:
+    """
+    Call sites of class_name.method_name (simple class name): edges whose receiver hint is that class,
+    plus edges with an unknown receiver when no other class declares a method with that name.
+    Returns [{"package", "class_name", "file_path", "method", "line", "receiver_type"}] ordered by caller;
+    None if the DB has no call graph (built before it existed).
+    """
+    try:
+        declaring = conn.execute(
+            "SELECT COUNT(DISTINCT class_id) AS n FROM methods WHERE method = ?", (method_name,)
+        ).fetchone()["n"]
+        rows = conn.execute(
+            """SELECT c.package, c.class_name, c.file_path, e.caller_method, e.line, e.receiver_type
+               FROM call_edges e
+               JOIN classes c ON c.id = e.caller_class_id
+               WHERE e.callee = ? AND (e.receiver_type = ? OR (? AND e.receiver_type IS NULL))
+               ORDER BY c.package, c.class_name, e.caller_method, e.line
+               LIMIT ?""",
+            (method_name, class_name, 1 if declaring <= 1 else 0, limit),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [
+        {
+            "package": r["package"],
+            "class_name": r["class_name"],
+            "file_path": r["file_path"],
+            "method": r["caller_method"],
+            "line": r["line"],
+            "receiver_type": r["receiver_type"],
+        }
+        for r in rows
+    ]
+
+
+def get_callees(conn: sqlite3.Connection, package: str, class_name: str, method_name: str) -> list[dict] | None:
+    """
+    Calls made by package.class_name.method_name: [{"callee", "receiver_type", "line"}] in source order.
+    None if the DB has no call graph.
+    """
+    try:
+        rows = conn.execute(
+            """SELECT e.callee, e.receiver_type, e.line
+               FROM call_edges e
+               JOIN classes c ON c.id = e.caller_class_id
+               WHERE c.package = ? AND c.class_name = ? AND e.caller_method = ?
+               ORDER BY e.line""",
+            (package, class_name, method_name),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [{"callee": r["callee"], "receiver_type": r["receiver_type"], "line": r["line"]} for r in rows]
+
+
+def resolve_method_class(
     conn: sqlite3.Connection,
-    package: str,
-    class_name: str,
-    kind: str,
-    method_name: str | None = None,
-    returns: str | None = None,
-    params: str | None = None,
-    const_name: str | None = None,
-    const_value: str | None = None,
-    snippet: str | None = None,
-) -> None:
-    """Inserts a row into the FTS5 table to make it searchable."""
-    conn.execute(
-        "INSERT INTO api_fts (package, class_name, kind, method_name, returns, params, const_name, const_value, snippet) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-        (package, class_name, kind, method_name, returns, params, const_name, const_value, snippet),
-    )
+    class_name: str | None,
+    method_name: str,
+    package_hint: str | None = None,
+) -> dict | None:
+    """
+    Picks the indexed class a call most likely targets: by simple class_name (same package as
+    package_hint first), or, with no class_name, the only class declaring method_name.
+    Returns {"package", "class_name", "file_path"} or None.
+    """
+    if class_name:
+        rows = conn.execute(
+            "SELECT package, class_name, file_path FROM classes WHERE class_name = ? ORDER BY package",
+            (class_name,),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            """SELECT DISTINCT c.package, c.class_name, c.file_path
+               FROM methods m JOIN classes c ON c.id = m.class_id
+               WHERE m.method = ? LIMIT 2""",
+            (method_name,),
+        ).fetchall()
+        if len(rows) != 1:
+            return None
+    if not rows:
+        return None
+    best = next((r for r in rows if r["package"] == package_hint), rows[0])
+    return {"package": best["package"], "class_name": best["class_name"], "file_path": best["file_path"]}
 
 
 def get_stats(conn: sqlite3.Connection) -> tuple[int, int, int]:
@@ -215,6 +988,22 @@ def get_stats(conn: sqlite3.Connection) -> tuple[int, int, int]:
     return classes, methods, constants
 
 
+def get_symbol_classes(conn: sqlite3.Connection) -> list[dict]:
+    """Every class as {"id", "package", "class_name", "kind"}: the classes of the in-memory symbol table (application.symbol_lookup)."""
+    return [
+        {"id": r["id"], "package": r["package"], "class_name": r["class_name"], "kind": r["kind"]}
+        for r in conn.execute("SELECT id, package, class_name, kind FROM classes ORDER BY package, class_name")
+    ]
+
+
+def get_symbol_members(conn: sqlite3.Connection) -> list[tuple[int, str]]:
+    """(class_id, name) of every method and constant (overloads repeat): the members of the symbol table."""
+    return [
+        (r[0], r[1])
+        for r in conn.execute("SELECT class_id, method FROM methods UNION ALL SELECT class_id, name FROM constants")
+    ]
+
+
 def get_class_and_methods(
     conn: sqlite3.Connection,
     package: str,
@@ -262,6 +1051,69 @@ def get_class_and_methods(
     }
 
 
+#_ Projectable fields of a class entry (package and class_name are always returned)
+CLASS_FIELDS = ("kind", "file_path", "parent", "interfaces", "methods", "constants")
+
+#_ (package, class_name) pairs per IN query (2 bound parameters each, under SQLite's variable limit)
+CLASS_BATCH_CHUNK = 400
+
+
+def get_classes(
+    conn: sqlite3.Connection,
+    keys: list[tuple[str, str]],
+    fields: set[str] | None = None,
+) -> dict[tuple[str, str], dict]:
+    """
+    Several classes at once, as get_class_and_methods builds them, keyed by (package, class_name); missing
+    classes are absent. One IN query per table (classes, then methods and constants of all found classes)
+    instead of three queries per class. fields limits the entry to package, class_name and those of
+    CLASS_FIELDS (None = all); methods/constants are not queried unless requested.
+    """
+    wanted = set(CLASS_FIELDS) if fields is None else set(fields) & set(CLASS_FIELDS)
+    rows = []
+    for i in range(0, len(keys), CLASS_BATCH_CHUNK):
+        chunk = keys[i:i + CLASS_BATCH_CHUNK]
+        rows.extend(conn.execute(
+            f"""SELECT id, package, class_name, kind, file_path, parent, interfaces FROM classes
+                WHERE (package, class_name) IN (VALUES {",".join(["(?, ?)"] * len(chunk))})""",
+            [v.strip() for key in chunk for v in key],
+        ))
+    found: dict[int, dict] = {}
+    for r in rows:
+        entry = {"package": r["package"], "class_name": r["class_name"]}
+        entry.update({f: r[f] for f in ("kind", "file_path", "parent", "interfaces") if f in wanted})
+        if "methods" in wanted:
+            entry["methods"] = []
+        if "constants" in wanted:
+            entry["constants"] = []
+        found[r["id"]] = entry
+
+    ids = list(found)
+    for i in range(0, len(ids), CLASS_BATCH_CHUNK * 2):
+        chunk = ids[i:i + CLASS_BATCH_CHUNK * 2]
+        marks = ",".join("?" * len(chunk))
+        if "methods" in wanted:
+            for m in conn.execute(
+                f"""SELECT class_id, method, returns, params, is_static, annotation FROM methods
+                    WHERE class_id IN ({marks}) ORDER BY class_id, method""",
+                chunk,
+            ):
+                found[m["class_id"]]["methods"].append({
+                    "method": m["method"],
+                    "returns": m["returns"],
+                    "params": m["params"],
+                    "is_static": bool(m["is_static"]),
+                    "annotation": m["annotation"],
+                })
+        if "constants" in wanted:
+            for c in conn.execute(
+                f"SELECT class_id, name, type, value FROM constants WHERE class_id IN ({marks}) ORDER BY class_id, name",
+                chunk,
+            ):
+                found[c["class_id"]]["constants"].append({"name": c["name"], "type": c["type"], "value": c["value"]})
+    return {(e["package"], e["class_name"]): e for e in found.values()}
+
+
 def get_method(
     conn: sqlite3.Connection,
     package: str,
@@ -364,59 +1216,138 @@ def search_fts(
     kind: str | None = None,
     unique_classes: bool = False,
 ) -> list[sqlite3.Row] | list[dict]:
-    """Searches in the FTS5 table api_fts. unique_classes: one entry per class with method_count."""
+    """
+    Searches in the FTS5 table api_fts. Bare identifiers also match camel-case sub-words of names
+    (search_utils.expand_identifier_terms: Spawn finds onEntitySpawned). Hits are hydrated by rowid
+    (a class, method or constant id) with primary-key lookups. unique_classes: one entry per class, grouped in SQL, ordered by its best hit,
+    with method_count = number of hits in the class (every hit is counted, not only the first page).
+    """
     if not query_term or not query_term.strip():
         return []
-    from . import search_utils
-    term = search_utils.sanitize_fts_query(query_term)
-    
-    fetch_limit = limit * 20 if unique_classes else limit
-    sql = """SELECT api_fts.package, api_fts.class_name, api_fts.kind, api_fts.method_name,
-             api_fts.returns, api_fts.params, api_fts.const_name, api_fts.const_value,
-             api_fts.snippet, c.file_path,
-             api_fts.rank
-             FROM api_fts JOIN classes c ON c.package = api_fts.package AND c.class_name = api_fts.class_name
+    term = search_utils.expand_identifier_terms(search_utils.sanitize_fts_query(query_term))
+
+    hits = """FROM api_fts
+             LEFT JOIN methods m ON m.id = api_fts.rowid
+             LEFT JOIN constants k ON k.id = api_fts.rowid
+             JOIN classes c ON c.id = COALESCE(m.class_id, k.class_id, api_fts.rowid)
              WHERE api_fts MATCH ?"""
     params: list = [term]
     if package_prefix and package_prefix.strip():
         p = package_prefix.strip()
         pattern = p if p.endswith(".") else f"{p}."
-        sql += " AND (c.package = ? OR c.package LIKE ?)"
+        hits += " AND (c.package = ? OR c.package LIKE ?)"
         params.extend([p, f"{pattern}%"])
     if kind and kind.strip():
-        sql += " AND api_fts.kind = ?"
+        hits += " AND c.kind = ?"
         params.append(kind.strip().lower())
-    sql += " ORDER BY api_fts.rank"
-    sql += " LIMIT ?"
-    params.append(fetch_limit)
-    cur = conn.execute(sql, params)
-    rows = cur.fetchall()
-    if not unique_classes:
-        return rows
-    seen: set[tuple[str, str]] = set()
-    out: list[dict] = []
-    for r in rows:
-        key = (r["package"], r["class_name"])
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append({
+    params.append(limit)
+
+    if unique_classes:
+        #_ rank is bm25 (lower is better): a class ranks by its best hit
+        cur = conn.execute(
+            f"""SELECT c.package, c.class_name, c.kind, c.file_path, COUNT(*) AS method_count
+                {hits}
+                GROUP BY c.id
+                ORDER BY MIN(api_fts.rank), c.package, c.class_name
+                LIMIT ?""",
+            params,
+        )
+        return [
+            {
+                "package": r["package"],
+                "class_name": r["class_name"],
+                "kind": r["kind"],
+                "file_path": r["file_path"],
+                "method_count": r["method_count"],
+            }
+            for r in cur.fetchall()
+        ]
+
+    cur = conn.execute(
+        f"""SELECT c.package, c.class_name, c.kind, m.method AS method_name,
+            m.returns, m.params, k.name AS const_name, k.value AS const_value,
+            CASE WHEN m.id IS NOT NULL THEN m.snippet WHEN k.id IS NOT NULL THEN k.snippet
+                 ELSE 'public ' || c.kind || ' ' || c.class_name END AS snippet,
+            c.file_path, api_fts.rank
+            {hits}
+            ORDER BY api_fts.rank
+            LIMIT ?""",
+        params,
+    )
+    return cur.fetchall()
+
+
+def find_implementations(conn: sqlite3.Connection, target_name: str, limit: int = 100) -> list[dict]:
+    """
+    Finds classes that implement an interface or extend a class, directly or transitively.
+    target_name is a simple name or FQCN. Uses type_closure (plus declared supertypes that are not
+    indexed, e.g. JDK types); DBs built before it existed fall back to LIKE on 'parent'/'interfaces'.
+    Each result has "depth" (1 = direct) when the closure is used.
+    """
+    try:
+        conn.execute("SELECT 1 FROM type_closure LIMIT 1")
+    except sqlite3.OperationalError:
+        return _find_implementations_like(conn, target_name, limit)
+
+    package, _, simple = target_name.strip().rpartition(".")
+    if package:
+        target_rows = conn.execute(
+            "SELECT id FROM classes WHERE package = ? AND class_name = ?", (package, simple)
+        ).fetchall()
+    else:
+        target_rows = conn.execute("SELECT id FROM classes WHERE class_name = ?", (simple,)).fetchall()
+    #_ Roots: the indexed target classes (depth 0) and classes declaring an unindexed type of that name (depth 1)
+    roots: dict[int, int] = {r["id"]: 0 for r in target_rows}
+    external = conn.execute(
+        "SELECT class_id, packages FROM supertypes WHERE super_id IS NULL AND name = ?", (simple,)
+    ).fetchall()
+    for r in external:
+        if not package or package in r["packages"].split(","):
+            roots.setdefault(r["class_id"], 1)
+
+    depths: dict[int, int] = {cid: d for cid, d in roots.items() if d > 0}
+    if roots:
+        marks = ",".join("?" * len(roots))
+        for r in conn.execute(
+            f"SELECT ancestor_id, descendant_id, depth FROM type_closure WHERE ancestor_id IN ({marks})",
+            list(roots),
+        ):
+            depth = roots[r["ancestor_id"]] + r["depth"]
+            if depth < depths.get(r["descendant_id"], depth + 1):
+                depths[r["descendant_id"]] = depth
+    for cid in roots:
+        if roots[cid] == 0:
+            depths.pop(cid, None)
+    if not depths:
+        return []
+
+    ids = list(depths)
+    rows = []
+    #_ Chunked IN lists stay below SQLite's host parameter limit
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        rows.extend(conn.execute(
+            f"SELECT id, package, class_name, kind, parent, interfaces, file_path FROM classes WHERE id IN ({marks})",
+            chunk,
+        ).fetchall())
+    rows.sort(key=lambda r: (r["package"], r["class_name"]))
+    return [
+        {
             "package": r["package"],
             "class_name": r["class_name"],
             "kind": r["kind"],
+            "parent": r["parent"],
+            "interfaces": r["interfaces"],
             "file_path": r["file_path"],
-            "method_count": sum(1 for x in rows if (x["package"], x["class_name"]) == key),
-        })
-        if len(out) >= limit:
-            break
-    return out
+            "depth": depths[r["id"]],
+        }
+        for r in rows[:limit]
+    ]
 
 
-def find_implementations(conn: sqlite3.Connection, target_name: str, limit: int = 100) -> list[dict]:
-    """
-    Finds classes that implement an interface or extend a class.
-    Searches in 'parent' and 'interfaces' columns.
-    """
+def _find_implementations_like(conn: sqlite3.Connection, target_name: str, limit: int = 100) -> list[dict]:
+    """Legacy lookup: substring match on the free-text 'parent'/'interfaces' columns."""
     term = f"%{target_name}%"
     cur = conn.execute(
         """SELECT package, class_name, kind, parent, interfaces, file_path 
@@ -490,46 +1421,256 @@ def find_systems_for_component(conn: sqlite3.Connection, component_name: str, li
     return [dict(r) for r in cur.fetchall()]
 
 
-def insert_asset(
-    conn: sqlite3.Connection,
-    path: str,
-    extension: str,
-    size: int,
-    category: str | None,
-    internal_id: str | None,
-    width: int | None,
-    height: int | None,
-    metadata: str | None,
-    version: str
-) -> None:
-    """Inserts an asset into assets and assets_fts tables."""
-    conn.execute(
-        """INSERT OR REPLACE INTO assets 
-           (path, extension, size, category, internal_id, width, height, metadata, version) 
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (path, extension, size, category, internal_id, width, height, metadata, version)
+def insert_assets(conn: sqlite3.Connection, rows: list[tuple], ref_rows: list[tuple[int, str, str]] = ()) -> None:
+    """
+    Inserts a batch of assets into assets and assets_fts tables (stale rows must be deleted first with delete_assets).
+    rows: (id, path, extension, size, crc, compress_size, category, internal_id, width, height, metadata, search_text, version),
+    metadata being zlib-compressed bytes. ref_rows: (source_id, ref, kind) references, unresolved until resolve_asset_refs.
+    """
+    conn.executemany("INSERT INTO asset_refs (source_id, ref, kind) VALUES (?, ?, ?)", ref_rows)
+    conn.executemany(
+        """INSERT INTO assets 
+           (id, path, extension, size, crc, compress_size, category, internal_id, width, height, metadata, search_text, version) 
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows
     )
-    conn.execute(
-        "INSERT INTO assets_fts (path, category, internal_id, metadata) VALUES (?, ?, ?, ?)",
-        (path, category, internal_id, metadata)
+    conn.executemany(
+        "INSERT INTO assets_fts (rowid, path, category, internal_id, search_text) VALUES (?, ?, ?, ?, ?)",
+        [(r[0], r[1], r[6], r[7], r[11]) for r in rows]
     )
 
 
+def _normalize_asset_ref(ref: str) -> str:
+    return ref.replace("\\", "/").lstrip("./").lower()
+
+
+def resolve_asset_refs(conn: sqlite3.Connection) -> None:
+    """
+    Points every reference at the asset it names (target_id), or NULL. A "path" ref matches an asset path
+    exactly or as a unique '/'-aligned suffix (refs are often relative to a root folder), case-insensitively;
+    failing that, like an "id" ref, it matches a unique internal id. References to the source itself are ignored.
+    """
+    by_path: dict[str, int] = {}
+    for r in conn.execute("SELECT id, path FROM assets"):
+        path = r["path"].lower()
+        by_path[path] = r["id"]
+        #_ Every '/'-aligned suffix; -1 marks a suffix shared by several assets (ambiguous)
+        cut = path.find("/")
+        while cut != -1:
+            suffix = path[cut + 1:]
+            if by_path.get(suffix, r["id"]) != r["id"]:
+                by_path[suffix] = -1
+            else:
+                by_path.setdefault(suffix, r["id"])
+            cut = path.find("/", cut + 1)
+    by_id: dict[str, int] = {}
+    for r in conn.execute("SELECT id, internal_id FROM assets WHERE internal_id IS NOT NULL"):
+        key = str(r["internal_id"])
+        by_id[key] = -1 if key in by_id else r["id"]
+
+    updates = []
+    for r in conn.execute("SELECT rowid, source_id, ref, kind, target_id FROM asset_refs"):
+        target = None
+        if r["kind"] == "path":
+            target = by_path.get(_normalize_asset_ref(r["ref"]))
+        if target is None:
+            target = by_id.get(r["ref"])
+        if target is not None and (target < 0 or target == r["source_id"]):
+            target = None
+        if target != r["target_id"]:
+            updates.append((target, r["rowid"]))
+    conn.executemany("UPDATE asset_refs SET target_id = ? WHERE rowid = ?", updates)
+
+
+#_ Hops followed by get_asset_refs
+ASSET_REFS_MAX_DEPTH = 10
+
+
+def get_asset_refs(conn: sqlite3.Connection, asset_id: int, reverse: bool = False, depth: int = 1, limit: int = 100) -> list[dict] | None:
+    """
+    Assets referenced by asset_id (or referencing it when reverse), transitively up to depth hops.
+    Returns [{"id", "path", "category", "internal_id", "extension", "depth", "via"}] ordered by depth then path,
+    via being the reference string (first hop: as written in the source asset). None if the reference table is missing.
+    """
+    depth = max(1, min(depth, ASSET_REFS_MAX_DEPTH))
+    near, far = ("target_id", "source_id") if reverse else ("source_id", "target_id")
+    try:
+        rows = conn.execute(
+            f"""WITH RECURSIVE walk(id, depth, via) AS (
+                    SELECT ?, 0, NULL
+                    UNION
+                    SELECT r.{far}, w.depth + 1, r.ref
+                    FROM walk w JOIN asset_refs r ON r.{near} = w.id
+                    WHERE w.depth < ? AND r.target_id IS NOT NULL
+                )
+                SELECT a.id, a.path, a.category, a.internal_id, a.extension, MIN(w.depth) AS depth, w.via
+                FROM walk w JOIN assets a ON a.id = w.id
+                WHERE w.id != ?
+                GROUP BY w.id
+                ORDER BY depth, a.path
+                LIMIT ?""",
+            (asset_id, depth, asset_id, limit),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [dict(r) for r in rows]
+
+
+def get_unresolved_asset_refs(conn: sqlite3.Connection, asset_id: int) -> list[str]:
+    """Path references of an asset that match no indexed asset (missing or outside Assets.zip)."""
+    cur = conn.execute(
+        "SELECT ref FROM asset_refs WHERE source_id = ? AND kind = 'path' AND target_id IS NULL ORDER BY ref",
+        (asset_id,),
+    )
+    return [r["ref"] for r in cur.fetchall()]
+
+
+def replace_asset_code_links(conn: sqlite3.Connection, rows: list[tuple[str, str, str, str, str]]) -> None:
+    """Replaces every asset_code_links row. rows: (category, folder, package, class_name, evidence)."""
+    conn.execute("DELETE FROM asset_code_links")
+    conn.executemany(
+        "INSERT OR IGNORE INTO asset_code_links (category, folder, package, class_name, evidence) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def get_asset_code_links(
+    conn: sqlite3.Connection,
+    category: str | None = None,
+    package: str | None = None,
+    class_name: str | None = None,
+    with_api: bool = False,
+) -> list[dict] | None:
+    """
+    Links by category (name or folder) or by class (class_name, optionally package). One row per class and
+    category with its evidence list; with_api adds kind and file_path from the ATTACHed "api" DB (NULL if the
+    class is no longer indexed). None if the links table is missing.
+    """
+    where, params = [], []
+    if category:
+        where.append("(l.category = ? OR l.folder = ?)")
+        params += [category, category]
+    if class_name:
+        where.append("l.class_name = ?")
+        params.append(class_name)
+    if package:
+        where.append("l.package = ?")
+        params.append(package)
+    api_cols = ", c.kind, c.file_path" if with_api else ""
+    api_join = "LEFT JOIN api.classes c ON c.package = l.package AND c.class_name = l.class_name" if with_api else ""
+    try:
+        rows = conn.execute(
+            f"""SELECT l.category, l.folder, l.package, l.class_name, group_concat(l.evidence) AS evidence{api_cols}
+                FROM asset_code_links l {api_join}
+                {"WHERE " + " AND ".join(where) if where else ""}
+                GROUP BY l.category, l.package, l.class_name
+                ORDER BY l.category, l.package, l.class_name""",
+            params,
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return [dict(r) | {"evidence": sorted(r["evidence"].split(","))} for r in rows]
+
+
+def get_category_assets(conn: sqlite3.Connection, category: str, limit: int = 5) -> tuple[int, list[str]]:
+    """(number of assets in the category, first paths)."""
+    count = conn.execute("SELECT COUNT(*) FROM assets WHERE category = ?", (category,)).fetchone()[0]
+    rows = conn.execute("SELECT path FROM assets WHERE category = ? ORDER BY path LIMIT ?", (category, limit)).fetchall()
+    return (count, [r["path"] for r in rows])
+
+
+def decode_asset_metadata(blob: bytes | str | None) -> str | None:
+    """Inflates the stored metadata of an asset (plain text in DBs written before compression)."""
+    if blob is None or isinstance(blob, str):
+        return blob
+    return zlib.decompress(blob).decode('utf-8', errors='ignore')
+
+
+def next_asset_id(conn: sqlite3.Connection) -> int:
+    """First unused asset id (ids are assigned by the indexer so changed assets can keep theirs)."""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'assets'").fetchone()
+    top = conn.execute("SELECT MAX(id) FROM assets").fetchone()[0]
+    return max(row[0] if row else 0, top or 0) + 1
+
+
 def search_assets_fts(conn: sqlite3.Connection, query_term: str, limit: int = 50) -> list[dict]:
-    """Searches assets using FTS5."""
+    """
+    Searches assets using FTS5 (matches are joined to assets by rowid = assets.id).
+    Rows do not include metadata: it is compressed and only needed when a single asset is inspected.
+    """
     if not query_term or not query_term.strip():
         return []
     
-    from . import search_utils
     term = search_utils.sanitize_fts_query(query_term)
     
     cur = conn.execute(
-        """SELECT a.path, a.extension, a.size, a.category, a.internal_id, a.width, a.height, a.metadata, a.version
-           FROM assets a
-           JOIN assets_fts f ON a.path = f.path
+        """SELECT a.path, a.extension, a.size, a.category, a.internal_id, a.width, a.height, a.version
+           FROM assets_fts f
+           JOIN assets a ON a.id = f.rowid
            WHERE assets_fts MATCH ?
            ORDER BY f.rank
            LIMIT ?""",
         (term, limit)
     )
     return [dict(r) for r in cur.fetchall()]
+
+
+#_ Columns and operators accepted by search_assets_faceted filters
+ASSET_FILTER_COLUMNS = frozenset(("category", "extension", "internal_id", "width", "height", "size"))
+ASSET_FILTER_OPERATORS = frozenset(("IN", "=", "<", "<=", ">", ">="))
+
+
+def search_assets_faceted(
+    conn: sqlite3.Connection,
+    text: str,
+    filters: list[tuple[str, str, object]],
+    limit: int = 50,
+) -> dict:
+    """
+    Asset search with column filters (see search_utils.parse_asset_query): filters run on the assets B-tree
+    indexes, text (if any) on assets_fts. Returns {"results": [...], "total": matches, "facets": {"category":
+    {value: count}, "extension": {value: count}}}, facets counted over every match (not only the first limit).
+    Results are ranked by FTS relevance with text, else ordered by path.
+    """
+    where, params = [], []
+    for column, op, value in filters:
+        if column not in ASSET_FILTER_COLUMNS or op not in ASSET_FILTER_OPERATORS:
+            continue
+        if op == "IN":
+            where.append(f"a.{column} IN ({','.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            where.append(f"a.{column} {op} ?")
+            params.append(value)
+    from_clause = "assets a"
+    order = "a.path"
+    if text and text.strip():
+        from_clause = "assets_fts f JOIN assets a ON a.id = f.rowid"
+        where.insert(0, "assets_fts MATCH ?")
+        params.insert(0, search_utils.sanitize_fts_query(text))
+        order = "f.rank"
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+    rows = conn.execute(
+        f"""SELECT a.path, a.extension, a.size, a.category, a.internal_id, a.width, a.height, a.version
+            FROM {from_clause} {where_clause}
+            ORDER BY {order}
+            LIMIT ?""",
+        (*params, limit),
+    ).fetchall()
+    #_ Both facets from one pass over the matches
+    facets: dict[str, dict[str, int]] = {"category": {}, "extension": {}}
+    total = 0
+    for r in conn.execute(
+        f"""WITH hits AS (SELECT a.category, a.extension FROM {from_clause} {where_clause})
+            SELECT 'category' AS facet, category AS value, COUNT(*) AS n FROM hits GROUP BY category
+            UNION ALL
+            SELECT 'extension', extension, COUNT(*) FROM hits GROUP BY extension
+            ORDER BY facet, n DESC, value""",
+        params,
+    ):
+        facets[r["facet"]][r["value"] or "-"] = r["n"]
+        if r["facet"] == "extension":
+            total += r["n"]
+    return {"results": [dict(r) for r in rows], "total": total, "facets": facets}
+
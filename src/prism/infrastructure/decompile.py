@@ -1,6 +1,8 @@
 # src/prism/infrastructure/decompile.py
 #? Decompilation pipeline: JADX.
 
+import hashlib
+import json
 import os
 import sys
 import subprocess
@@ -30,11 +32,155 @@ def check_java() -> bool:
         return False
 
 
+#_ Per-class bytecode digests of the last decompiled JAR, stored inside the output directory
+CLASS_MANIFEST_FILENAME = ".prism_classes.json"
+
+
 class DecompilerEngine:
     """Base class for decompiler engines."""
-    def run(self, jar_path: Path, out_dir: Path, decompiler_jar: Path, log_path: Path | None = None) -> tuple[bool, dict | None]:
+
+    #_ Engine id stored in the class manifest (a manifest from another engine forces a full run)
+    name = ""
+    #_ Subdirectory of the output where the engine writes .java files ("" = output root)
+    sources_subdir = ""
+
+    def _decompile(
+        self,
+        jar_path: Path,
+        out_dir: Path,
+        decompiler_jar: Path,
+        log_path: Path | None = None,
+        library_jar: Path | None = None,
+    ) -> tuple[bool, dict | None]:
+        """Runs the decompiler on jar_path into out_dir. library_jar: full JAR for resolving references (delta runs)."""
         raise NotImplementedError
 
+    def run(
+        self,
+        jar_path: Path,
+        out_dir: Path,
+        decompiler_jar: Path,
+        log_path: Path | None = None,
+        rebuild: bool = False,
+    ) -> tuple[bool, dict | None]:
+        """
+        Decompiles jar_path into out_dir. If out_dir holds a class manifest from a previous run with
+        this engine, only top-level classes whose bytecode changed (CRC of the class and its inner
+        '$' classes) are decompiled from a delta JAR and merged; sources of removed classes are deleted.
+        rebuild=True (or no usable manifest) wipes out_dir and decompiles everything.
+        """
+        start_time = time.time()
+        digests = self.class_digests(jar_path)
+        previous = None if rebuild else self._load_class_manifest(out_dir)
+
+        if previous is None:
+            if out_dir.exists():
+                shutil.rmtree(out_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            ok, stats = self._decompile(jar_path, out_dir, decompiler_jar, log_path)
+            if ok:
+                self._save_class_manifest(out_dir, digests)
+                stats["changed_classes"] = len(digests)
+            return (ok, stats)
+
+        changed = [cls for cls, digest in digests.items() if previous.get(cls) != digest]
+        removed = [cls for cls in previous if cls not in digests]
+        for cls in changed + removed:
+            for candidate in self._source_paths(out_dir, cls):
+                if candidate.is_file():
+                    candidate.unlink()
+
+        had_errors = False
+        if changed:
+            delta_jar = out_dir.parent / f"{jar_path.stem}_delta.jar"
+            delta_dir = out_dir.parent / f"{out_dir.name}_delta"
+            if delta_dir.exists():
+                shutil.rmtree(delta_dir)
+            delta_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                if not self._write_delta_jar(jar_path, delta_jar, set(changed)):
+                    return (False, None)
+                ok, stats = self._decompile(delta_jar, delta_dir, decompiler_jar, log_path, library_jar=jar_path)
+                if not ok:
+                    return (False, None)
+                had_errors = stats["had_errors"]
+                #_ Merge the delta tree into the existing output
+                for src in delta_dir.rglob("*"):
+                    if src.is_file():
+                        dest = out_dir / src.relative_to(delta_dir)
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        shutil.move(str(src), str(dest))
+            finally:
+                shutil.rmtree(delta_dir, ignore_errors=True)
+                delta_jar.unlink(missing_ok=True)
+
+        self._save_class_manifest(out_dir, digests)
+        return (True, {
+            "had_errors": had_errors,
+            "total_files": sum(1 for _ in out_dir.rglob("*.java")),
+            "elapsed_time": time.time() - start_time,
+            "changed_classes": len(changed) + len(removed),
+        })
+
+    @staticmethod
+    def class_digests(jar_path: Path) -> dict[str, str]:
+        """
+        Maps each top-level class ('com/x/Foo') to a digest of the CRC32 and size of Foo.class and
+        every Foo$*.class, read from the ZIP central directory (nothing is inflated).
+        """
+        parts: dict[str, list[str]] = {}
+        with zipfile.ZipFile(jar_path, 'r') as z:
+            for info in z.infolist():
+                if not info.filename.endswith(".class"):
+                    continue
+                top = info.filename[:-len(".class")].split("$", 1)[0]
+                parts.setdefault(top, []).append(f"{info.filename}:{info.CRC:08x}:{info.file_size}")
+        return {
+            top: hashlib.sha1("\n".join(sorted(entries)).encode("utf-8")).hexdigest()
+            for top, entries in parts.items()
+        }
+
+    @staticmethod
+    def _write_delta_jar(jar_path: Path, delta_jar: Path, classes: set[str]) -> bool:
+        """Copies the .class entries of the given top-level classes (with inner classes) into delta_jar."""
+        try:
+            with zipfile.ZipFile(jar_path, 'r') as zin:
+                with zipfile.ZipFile(delta_jar, 'w', compression=zipfile.ZIP_STORED) as zout:
+                    for item in zin.infolist():
+                        if not item.filename.endswith(".class"):
+                            continue
+                        if item.filename[:-len(".class")].split("$", 1)[0] in classes:
+                            zout.writestr(item, zin.read(item.filename))
+            return True
+        except Exception as e:
+            print(f"Error creating delta JAR: {e}", file=sys.stderr)
+            return False
+
+    def _source_paths(self, out_dir: Path, top_class: str) -> list[Path]:
+        """Possible locations of the .java file generated for a top-level class."""
+        rel = f"{top_class}.java"
+        if self.sources_subdir:
+            return [out_dir / self.sources_subdir / rel, out_dir / rel]
+        return [out_dir / rel]
+
+    def _load_class_manifest(self, out_dir: Path) -> dict[str, str] | None:
+        """Digests of the last run; None if missing, unreadable or written by another engine."""
+        path = out_dir / CLASS_MANIFEST_FILENAME
+        if not path.is_file():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if data.get("engine") != self.name or not isinstance(data.get("classes"), dict):
+            return None
+        return data["classes"]
+
+    def _save_class_manifest(self, out_dir: Path, digests: dict[str, str]) -> None:
+        with open(out_dir / CLASS_MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({"engine": self.name, "classes": digests}, f)
+
     def create_slim_jar(self, input_jar: Path, output_jar: Path) -> bool:
         """Creates a temporary JAR containing only core Hytale packages."""
         #_ Optimization: Use cache if input JAR hasn't changed
@@ -58,11 +204,18 @@ class DecompilerEngine:
             return False
 
 class JadxEngine(DecompilerEngine):
-    def run(self, jar_path: Path, out_dir: Path, decompiler_jar: Path, log_path: Path | None = None) -> tuple[bool, dict | None]:
-        if out_dir.exists():
-            shutil.rmtree(out_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        
+    name = "jadx"
+    sources_subdir = "sources"
+
+    def _decompile(
+        self,
+        jar_path: Path,
+        out_dir: Path,
+        decompiler_jar: Path,
+        log_path: Path | None = None,
+        library_jar: Path | None = None,
+    ) -> tuple[bool, dict | None]:
+        #_ JADX CLI has no classpath option: delta runs decompile the changed classes on their own
         cpu_cores = os.cpu_count() or 4
         cmd = [
             "java",
@@ -139,11 +292,16 @@ class JadxEngine(DecompilerEngine):
             return (False, None)
 
 class VineflowerEngine(DecompilerEngine):
-    def run(self, jar_path: Path, out_dir: Path, decompiler_jar: Path, log_path: Path | None = None) -> tuple[bool, dict | None]:
-        if out_dir.exists():
-            shutil.rmtree(out_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        
+    name = "vineflower"
+
+    def _decompile(
+        self,
+        jar_path: Path,
+        out_dir: Path,
+        decompiler_jar: Path,
+        log_path: Path | None = None,
+        library_jar: Path | None = None,
+    ) -> tuple[bool, dict | None]:
         cpu_cores = os.cpu_count() or 4
         cmd = [
             "java",
@@ -154,6 +312,11 @@ class VineflowerEngine(DecompilerEngine):
             f"--threads={cpu_cores}",
             "--rsy=1",
             "--dgs=1",
+        ]
+        if library_jar:
+            #_ Full JAR as library so references from the delta classes still resolve
+            cmd.append(f"-e={library_jar.resolve()}")
+        cmd += [
             str(jar_path.resolve()),
             str(out_dir.resolve()),
         ]
@@ -244,10 +407,12 @@ def get_engine(name: str) -> DecompilerEngine:
 def run_decompile_only_for_version(
     root: Path | None, 
     version: str, 
-    engine_name: str | None = None
+    engine_name: str | None = None,
+    rebuild: bool = False,
 ) -> tuple[bool, str | dict]:
     """
     Runs decompiler for a version. Returns (True, stats_dict) or (False, err_key).
+    Only classes changed since the last run are decompiled unless rebuild is True.
     """
     root = root or config_impl.get_project_root()
     if version == "release":
@@ -289,7 +454,7 @@ def run_decompile_only_for_version(
     if not engine.create_slim_jar(jar_path, slim_jar):
         return (False, "decompile_failed")
 
-    ok, stats = engine.run(slim_jar, raw_dir, decompiler_jar, log_path)
+    ok, stats = engine.run(slim_jar, raw_dir, decompiler_jar, log_path, rebuild=rebuild)
     if not ok:
         return (False, "decompile_failed")
     return (True, stats)
@@ -298,16 +463,17 @@ def run_decompile_only_for_version(
 def run_decompile_only(
     root: Path | None = None,
     versions: list[str] | None = None,
-    engine_name: str | None = None
+    engine_name: str | None = None,
+    rebuild: bool = False,
 ) -> tuple[bool, str | list[dict]]:
-    """Runs decompiler only (without pruning)."""
+    """Runs decompiler only (without pruning). rebuild: decompile every class instead of only changed ones."""
     root = root or config_impl.get_project_root()
     if versions is None:
         versions = [config_impl.get_active_version(root)]
     
     all_stats = []
     for version in versions:
-        ok, result = run_decompile_only_for_version(root, version, engine_name=engine_name)
+        ok, result = run_decompile_only_for_version(root, version, engine_name=engine_name, rebuild=rebuild)
         if not ok:
             return (False, result)
         all_stats.append(result)
@@ -1,12 +1,18 @@
 # src/prism/infrastructure/extractor.py
 #? API extractor from decompiled Java code (regex). Feeds SQLite + FTS5.
 
+import bisect
+import hashlib
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
 #_ from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
 
+from ..domain.constants import JAVA_RESERVED_WORDS, RE_IDENTIFIER_TOKEN
 from . import config_impl
 from . import db
 from ..entrypoints.cli import out
@@ -14,8 +20,12 @@ from ..entrypoints.cli import out
 #_ Files processed between each commit to reduce transaction size and memory
 BATCH_COMMIT_FILES = 1000
 
+#_ Files handed to a worker process at once (amortizes pickling/IPC per task)
+EXTRACT_CHUNK_FILES = 64
+
 #_ Same regex as Server/Scripts/generate_api_context.py (but improved)
 RE_PACKAGE = re.compile(r"package\s+([\w\.]+);")
+RE_IMPORT = re.compile(r"^\s*import\s+(static\s+)?([\w.]+?)(\.\*)?\s*;", re.MULTILINE)
 RE_CLASS = re.compile(
     r"public\s+(?:abstract\s+|final\s+)?(class|interface|record|enum)\s+(\w+)"
     r"(?:\s+extends\s+([\w\<\>\.,\s]+?))?"
@@ -30,180 +40,543 @@ RE_CONSTANT = re.compile(
 )
 
 
-def _extract_from_java(content: str, file_path: str) -> list[tuple[str, str, str, list[dict], str | None, str | None, list[dict]]]:
+#_ Lexer tokens: text blocks, string/char literals and comments are consumed whole so their braces are ignored
+RE_SCOPE_TOKEN = re.compile(
+    r'"""[\s\S]*?"""'
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r"|//[^\n]*"
+    r"|/\*[\s\S]*?\*/"
+    r"|[{}]"
+)
+
+
+#_ Literals and comments only (masked out before looking for calls)
+RE_LITERAL = re.compile(
+    r'"""[\s\S]*?"""'
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r"|//[^\n]*"
+    r"|/\*[\s\S]*?\*/"
+)
+RE_NOT_NEWLINE = re.compile(r"[^\n]")
+
+RE_OPEN_PAREN = re.compile(r"\(")
+#_ Call site read backwards from its '(' on the reversed code: 1:callee, 2:'.', 3:receiver word (all reversed).
+#_ Matching anchored at each '(' is much cheaper than scanning forwards for 'receiver . name ('.
+RE_CALL_REVERSED = re.compile(r"\s*([\w$]*[A-Za-z_$])(?![\w$])\s*(\.)?\s*(\w+)?")
+#_ Typed declaration 'Type<..>[] name' (field, local, parameter, for-each variable), read backwards from name: 1:Type (reversed)
+RE_DECL_TYPE_REVERSED = re.compile(r"\s+(?:\]\s*\[\s*)*(?:>[^;(){}=]*<\s*)?([\w$]*[A-Z])(?![\w$])")
+#_ What may follow a declared name
+RE_DECL_END = re.compile(r"\s*[=;,):]")
+RE_BODY_START = re.compile(r"[{;]")
+#_ Words that look like calls before '(' but are not
+CALL_KEYWORDS = frozenset((
+    "if", "for", "while", "switch", "catch", "synchronized", "return", "throw", "new", "this", "super",
+    "try", "assert", "yield", "case", "else", "do",
+))
+#_ Words allowed right before an unqualified call (anything else there is 'Type name(' = a declaration)
+CALL_PREFIX_WORDS = frozenset(("return", "throw", "else", "yield", "case", "assert", "do"))
+
+
+def _mask_literals(content: str) -> str:
+    """Replaces string/char literals, text blocks and comments with spaces (newlines kept, offsets unchanged)."""
+    return RE_LITERAL.sub(lambda m: RE_NOT_NEWLINE.sub(" ", m.group()), content)
+
+
+def _declared_type(code: str, reversed_code: str, name: str) -> str | None:
+    """Type of the last 'Type name' declaration of name in the file (fields, locals, parameters), or None."""
+    found = None
+    size = len(code)
+    pos = code.find(name)
+    while pos != -1:
+        end = pos + len(name)
+        whole_word = (pos == 0 or not (code[pos - 1].isalnum() or code[pos - 1] in "_$")) and (
+            end == size or not (code[end].isalnum() or code[end] in "_$")
+        )
+        if whole_word and RE_DECL_END.match(code, end):
+            m = RE_DECL_TYPE_REVERSED.match(reversed_code, size - pos)
+            if m:
+                found = m.group(1)[::-1]
+        pos = code.find(name, end)
+    return found
+
+
+def _method_calls(
+    code: str,
+    reversed_code: str,
+    body: tuple[int, int],
+    newlines: list[int],
+    owner: str,
+    owner_parent: str | None,
+    var_types: dict[str, str | None],
+) -> list[tuple[str, str | None, int]]:
+    """
+    Call sites inside a method body as (callee, receiver_type, line). code is the literal-masked file,
+    reversed_code the same string reversed.
+    receiver_type is a simple class name hint: the owner for unqualified/this calls, the parent for
+    super calls, the declared type of a receiver variable, the receiver itself if it looks like a class,
+    or None when unknown (e.g. chained calls). var_types caches declared types per file (filled lazily).
+    """
+    calls: list[tuple[str, str | None, int]] = []
+    seen: set[tuple[str, str | None, int]] = set()
+    size = len(code)
+    for paren in RE_OPEN_PAREN.finditer(code, body[0] + 1, body[1]):
+        m = RE_CALL_REVERSED.match(reversed_code, size - paren.start())
+        if m is None:
+            continue
+        callee = m.group(1)[::-1]
+        if callee in CALL_KEYWORDS:
+            continue
+        dot = m.group(2)
+        receiver = m.group(3)[::-1] if m.group(3) else None
+        if dot:
+            if receiver is None:
+                receiver_type = None
+            elif receiver == "this":
+                receiver_type = owner
+            elif receiver == "super":
+                receiver_type = owner_parent
+            else:
+                if receiver not in var_types:
+                    var_types[receiver] = _declared_type(code, reversed_code, receiver)
+                receiver_type = var_types[receiver]
+                if receiver_type is None and receiver[0].isupper():
+                    receiver_type = receiver
+        else:
+            if receiver is not None and receiver not in CALL_PREFIX_WORDS:
+                continue #_ 'Type name(' is a declaration (local/anonymous class method), 'new X(' a constructor
+            receiver_type = owner
+        edge = (callee, receiver_type, bisect.bisect_right(newlines, size - m.end(1)) + 1)
+        if edge not in seen:
+            seen.add(edge)
+            calls.append(edge)
+    return calls
+
+
+def _match_braces(content: str) -> dict[int, int]:
     """
-    Extracts from a Java file: package, class_name, kind, methods, parent, interfaces, and constants.
-    Uses bracket tracking to correctly attribute items to inner/multiple classes.
+    Single pass over the file: maps the position of every code '{' to its matching '}'.
+    Braces inside string/char literals, text blocks and comments are skipped.
+    Unbalanced opening braces (truncated files) map to len(content).
+    """
+    pairs: dict[int, int] = {}
+    stack: list[int] = []
+    for tok in RE_SCOPE_TOKEN.finditer(content):
+        ch = tok.group()
+        if ch == "{":
+            stack.append(tok.start())
+        elif ch == "}":
+            if stack:
+                pairs[stack.pop()] = tok.start()
+    for pos in stack:
+        pairs[pos] = len(content)
+    return pairs
+
+
+def _import_packages(path: str) -> list[str]:
+    """Package candidates of an imported type's owner: 'a.b.Outer' -> ['a.b.Outer', 'a.b'] (nested types live in the file package)."""
+    candidates = [path]
+    parts = path.split(".")
+    while len(parts) > 1 and parts[-1][:1].isupper():
+        parts.pop()
+        if parts[-1][:1].islower():
+            candidates.append(".".join(parts))
+    return candidates
+
+
+def _supertype_refs(
+    declared: str | None,
+    via_extends: bool,
+    pkg: str,
+    imports: dict[str, list[str]],
+    wildcards: list[str],
+) -> list[tuple[str, str, bool]]:
+    """
+    Splits an extends/implements list into (simple_name, "pkg1,pkg2", via_extends) references.
+    The packages are the candidates to look the type up in, most likely first: the explicit
+    qualifier, the single-type import, then the file package and wildcard imports.
+    """
+    refs: list[tuple[str, str, bool]] = []
+    for part in (declared or "").split(","):
+        name_match = re.match(r"[\w.]+", part.strip())
+        if not name_match:
+            continue
+        head, _, simple = name_match.group().rpartition(".")
+        if head and head[:1].islower():
+            packages = _import_packages(head)
+        elif head:
+            #_ Outer.Inner: resolve through the outer type
+            outer = head.split(".")[0]
+            packages = imports.get(outer, [pkg] + wildcards)
+        else:
+            packages = imports.get(simple, [pkg] + wildcards)
+        refs.append((simple, ",".join(dict.fromkeys(packages)), via_extends))
+    return refs
+
+
+def _innermost_span(spans: list[tuple[int, int]], positions: list[int]) -> list[int | None]:
+    """
+    For each position (ascending) returns the index of the innermost span containing it, or None.
+    spans are (open_brace, close_brace) sorted by start; they nest like the class tree of the file.
+    Linear sweep with a stack of currently open spans.
+    """
+    owners: list[int | None] = []
+    stack: list[int] = []
+    i = 0
+    for pos in positions:
+        while i < len(spans) and spans[i][0] < pos:
+            while stack and spans[stack[-1]][1] < spans[i][0]:
+                stack.pop()
+            stack.append(i)
+            i += 1
+        while stack and spans[stack[-1]][1] < pos:
+            stack.pop()
+        owners.append(stack[-1] if stack else None)
+    return owners
+
+
+def _extract_from_java(content: str, file_path: str) -> list[tuple[str, str, str, list[dict], str | None, str | None, list[dict], list[tuple[str, str, bool]]]]:
+    """
+    Extracts from a Java file: package, class_name, kind, methods, parent, interfaces, constants and
+    supertype references (parent/interfaces split, with package candidates from the file's imports).
+    Builds the class-span tree in one lexer pass and assigns each method/constant to its innermost class.
     """
     pkg_match = RE_PACKAGE.search(content)
     if not pkg_match:
         return []
     pkg = pkg_match.group(1)
 
-    classes_found = list(RE_CLASS.finditer(content))
+    braces = _match_braces(content)
+    #_ A declaration whose '{' is not a code brace lives in a comment or string literal
+    classes_found = [m for m in RE_CLASS.finditer(content) if (m.end() - 1) in braces]
     if not classes_found:
         return []
 
-    final_results = []
-    
+    #_ One span per class: from its '{' (RE_CLASS ends at it) to the matching '}'
+    spans: list[tuple[int, int]] = []
     for class_match in classes_found:
+        first_brace = class_match.end() - 1
+        spans.append((first_brace, braces[first_brace]))
+
+    class_methods: list[list[dict]] = [[] for _ in classes_found]
+    class_constants: list[list[dict]] = [[] for _ in classes_found]
+
+    #_ Call graph inputs: masked code, line offsets, simple parent names and a cache of declared variable types
+    code = _mask_literals(content)
+    reversed_code = code[::-1]
+    newlines = [nl.start() for nl in re.finditer("\n", content)]
+    parents_simple = [
+        re.sub(r"\<.*?\>", "", cm.group(3)).strip().rsplit(".", 1)[-1] if cm.group(3) else None
+        for cm in classes_found
+    ]
+    var_types: dict[str, str | None] = {}
+
+    #_ Methods
+    method_matches = list(RE_METHOD.finditer(content))
+    for m, owner in zip(method_matches, _innermost_span(spans, [m.start() for m in method_matches])):
+        if owner is None:
+            continue
+        #_ RE_METHOD groups: 1:@Annotation, 2:Returns, 3:Name, 4:Params
+        m_name = m.group(3)
+        if m_name == classes_found[owner].group(2): continue #_ Constructor
+
+        #_ Capture the full signature as a snippet
+        snippet = m.group(0).strip()
+
+        #_ Body: the first '{' after the signature, unless a ';' (abstract/interface method) comes first
+        calls: list[tuple[str, str | None, int]] = []
+        body_start = RE_BODY_START.search(code, m.end())
+        if body_start and body_start.group() == "{" and body_start.start() in braces:
+            body = (body_start.start(), braces[body_start.start()])
+            calls = _method_calls(code, reversed_code, body, newlines, classes_found[owner].group(2), parents_simple[owner], var_types)
+
+        class_methods[owner].append({
+            "method": m_name,
+            "returns": m.group(2),
+            "params": m.group(4).strip(),
+            "is_static": "static" in m.group(0),
+            "annotation": m.group(1).strip() if m.group(1) else None,
+            "snippet": snippet,
+            "calls": calls,
+        })
+
+    #_ Constants
+    const_matches = list(RE_CONSTANT.finditer(content))
+    for c, owner in zip(const_matches, _innermost_span(spans, [c.start() for c in const_matches])):
+        if owner is None:
+            continue
+        #_ RE_CONSTANT groups: 1:Type, 2:Name, 3:Value
+        class_constants[owner].append({
+            "name": c.group(2),
+            "type": c.group(1),
+            "value": c.group(3).strip().strip('"'),
+            "snippet": c.group(0).strip()
+        })
+
+    imports: dict[str, list[str]] = {}
+    wildcards: list[str] = []
+    for im in RE_IMPORT.finditer(content):
+        if im.group(1):
+            continue #_ static import
+        if im.group(3):
+            wildcards.append(im.group(2))
+        else:
+            owner, _, simple = im.group(2).rpartition(".")
+            imports[simple] = _import_packages(owner) if owner else [pkg]
+
+    final_results = []
+    for idx, class_match in enumerate(classes_found):
         kind = class_match.group(1)
         name = class_match.group(2)
         parent = class_match.group(3).strip() if class_match.group(3) else None
         interfaces = class_match.group(4).strip() if class_match.group(4) else None
-        
+
         #_ Clean generics from parent/interfaces for better indexing/linking
         if parent: parent = re.sub(r"\<.*?\>", "", parent).strip()
         if interfaces: interfaces = re.sub(r"\<.*?\>", "", interfaces).strip()
 
-        start_search = class_match.end()
-        
-        #_ Find the first '{' (which is actually part of the RE_CLASS match, but let's be careful)
-        #_ Actually RE_CLASS ends at '{', so start_search is right after '{'
-        first_brace = class_match.end() - 1 #_ Position of '{'
-        
-        #_ Track braces to find the closing '}'
-        depth = 1
-        end_search = -1
-        for i in range(first_brace + 1, len(content)):
-            if content[i] == '{': depth += 1
-            elif content[i] == '}':
-                depth -= 1
-                if depth == 0:
-                    end_search = i
-                    break
-        
-        if end_search == -1: end_search = len(content)
-        
-        #_ Extract items only within [first_brace, end_search]
-        class_content = content[first_brace:end_search]
-        
-        #_ Methods
-        methods = []
-        for m in RE_METHOD.finditer(class_content):
-            #_ RE_METHOD groups: 1:@Annotation, 2:Returns, 3:Name, 4:Params
-            m_name = m.group(3)
-            if m_name == name: continue #_ Constructor
-            
-            #_ Capture the full signature as a snippet
-            snippet = m.group(0).strip()
-            
-            methods.append({
-                "method": m_name,
-                "returns": m.group(2),
-                "params": m.group(4).strip(),
-                "is_static": "static" in m.group(0),
-                "annotation": m.group(1).strip() if m.group(1) else None,
-                "snippet": snippet
-            })
-        
-        #_ Constants
-        constants = []
-        for c in RE_CONSTANT.finditer(class_content):
-            #_ RE_CONSTANT groups: 1:Type, 2:Name, 3:Value
-            constants.append({
-                "name": c.group(2),
-                "type": c.group(1),
-                "value": c.group(3).strip().strip('"'),
-                "snippet": c.group(0).strip()
-            })
-        
-        final_results.append((pkg, name, kind, methods, parent, interfaces, constants))
-        
+        #_ 'interface X extends A, B' lists interfaces after extends: they are still extends edges
+        supertypes = _supertype_refs(parent, True, pkg, imports, wildcards) + _supertype_refs(interfaces, False, pkg, imports, wildcards)
+
+        final_results.append((pkg, name, kind, class_methods[idx], parent, interfaces, class_constants[idx], supertypes))
+
     return final_results
 
 
-def run_index(root: Path | None = None, version: str = "release") -> tuple[bool, str | tuple[int, int, int]]:
+def _file_digest(data: bytes) -> str:
+    """Content hash stored in the files manifest."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def _identifier_postings(content: str) -> dict[str, str]:
+    """
+    Line numbers of every indexed identifier of a file: {identifier: "3,3,17"} (one entry per
+    occurrence, like the matches of a \\bword\\b scan). Comments and strings are included too.
+    """
+    lines_by_name: dict[str, list[str]] = {}
+    for line_no, line in enumerate(content.split("\n"), 1):
+        line_str = str(line_no)
+        #_ Same tokens as is_indexed_identifier accepts, inlined: this runs for every word of the tree
+        for token in RE_IDENTIFIER_TOKEN.findall(line):
+            if token in JAVA_RESERVED_WORDS:
+                continue
+            lines = lines_by_name.get(token)
+            if lines is None:
+                lines_by_name[token] = [line_str]
+            else:
+                lines.append(line_str)
+    return {name: ",".join(lines) for name, lines in lines_by_name.items()}
+
+
+def _extract_file(job: tuple[str, str, int, int]) -> tuple[str, int, int, str, list, dict[str, str]] | None:
+    """
+    Worker task: reads one .java file, hashes it, runs _extract_from_java on it and collects its
+    identifier postings. job is (absolute_path, relative_path, size, mtime_ns). Returns
+    (relative_path, size, mtime_ns, digest, results, postings) or None if unreadable.
+    Top-level so it can be pickled into ProcessPoolExecutor workers.
+    """
+    path_str, file_path_str, size, mtime_ns = job
+    try:
+        data = Path(path_str).read_bytes()
+    except OSError:
+        return None
+    #_ Same newline handling as Path.read_text
+    content = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+    return (
+        file_path_str,
+        size,
+        mtime_ns,
+        _file_digest(data),
+        _extract_from_java(content, file_path_str),
+        _identifier_postings(content),
+    )
+
+
+def _iter_extracted(jobs_list: list[tuple[str, str, int, int]], jobs: int) -> Iterator[tuple[str, int, int, str, list, dict[str, str]] | None]:
+    """
+    Yields _extract_file results in the same order as jobs_list.
+    With jobs > 1 files are parsed in a process pool (in chunks); the caller stays the single DB writer.
+    """
+    if jobs <= 1 or len(jobs_list) < EXTRACT_CHUNK_FILES:
+        for job in jobs_list:
+            yield _extract_file(job)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        #_ map() preserves input order, so the resulting DB is identical to a sequential run
+        yield from pool.map(_extract_file, jobs_list, chunksize=EXTRACT_CHUNK_FILES)
+
+
+def _path_job(sources_dir: Path, file_path_str: str) -> tuple[str, str, int, int] | None:
+    """Extraction job of an indexed file (path relative to sources_dir), or None if it no longer exists."""
+    jpath = sources_dir / file_path_str
+    try:
+        st = jpath.stat()
+    except OSError:
+        return None
+    return (str(jpath), file_path_str, st.st_size, st.st_mtime_ns)
+
+
+def _plan_incremental(
+    conn,
+    sources_dir: Path,
+    java_files: list[Path],
+) -> tuple[list[tuple[str, str, int, int]], list[str], list[str]]:
+    """
+    Diffs the source tree against the files manifest.
+    Returns (extract_jobs, stale_paths, deleted_paths): jobs for added/changed files, indexed files whose
+    content changed, and indexed files that no longer exist. Files whose size/mtime changed but whose
+    content hash did not are only re-stamped in the manifest. Files that share a class with a stale or
+    deleted file (see db.get_shared_class_files) are stale too: the class is rebuilt from all of them.
+    """
+    manifest = db.get_file_manifest(conn)
+    extract_jobs: list[tuple[str, str, int, int]] = []
+    stale: list[str] = []
+    touched: list[tuple[int, int, str]] = []
+    seen: set[str] = set()
+
+    for jpath in java_files:
+        #_ Relative path to the decompiled directory for storage
+        try:
+            rel_path = jpath.relative_to(sources_dir)
+        except ValueError:
+            rel_path = jpath
+        file_path_str = str(rel_path).replace("\\", "/")
+        try:
+            st = jpath.stat()
+        except OSError:
+            continue
+        seen.add(file_path_str)
+        job = (str(jpath), file_path_str, st.st_size, st.st_mtime_ns)
+
+        known = manifest.get(file_path_str)
+        if known is None:
+            extract_jobs.append(job)
+            continue
+        if known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            continue
+        #_ Stat changed (e.g. the file was rewritten by the decompiler): compare content
+        try:
+            unchanged = _file_digest(jpath.read_bytes()) == known["digest"]
+        except OSError:
+            unchanged = False
+        if unchanged:
+            touched.append((st.st_size, st.st_mtime_ns, file_path_str))
+        else:
+            stale.append(file_path_str)
+            extract_jobs.append(job)
+
+    db.touch_files(conn, touched)
+    deleted = [path for path in manifest if path not in seen]
+    if stale or deleted:
+        planned = set(stale) | set(deleted)
+        for path in db.get_shared_class_files(conn, stale + deleted):
+            job = _path_job(sources_dir, path) if path not in planned else None
+            if job:
+                stale.append(path)
+                extract_jobs.append(job)
+        #_ Same order as java_files, so a shared class is rebuilt as a full index builds it
+        extract_jobs.sort(key=lambda job: Path(job[0]))
+    return extract_jobs, stale, deleted
+
+
+def _write_extracted(conn, extract_jobs: list[tuple[str, str, int, int]], jobs: int, progress, task) -> set[int]:
+    """
+    Extracts the files of extract_jobs and writes their rows (committing every BATCH_COMMIT_FILES files).
+    Returns the ids of classes that already existed and were declared again (BatchWriter.reused_class_ids).
+    """
+    writer = db.BatchWriter(conn)
+    files_processed = 0
+    for extracted in _iter_extracted(extract_jobs, jobs):
+        if extracted is None:
+            progress.update(task, advance=1)
+            continue
+        file_path_str, size, mtime_ns, digest, results, postings = extracted
+        file_id = writer.add_file(file_path_str, size, mtime_ns, digest)
+        writer.add_postings(file_id, postings)
+
+        #_ Queue rows (extraction already happened, possibly in a worker process)
+        for pkg, class_name, kind, methods, parent, interfaces, constants, supertypes in results:
+            class_id = writer.add_class(pkg, class_name, kind, file_path_str, parent, interfaces)
+            writer.add_supertypes(class_id, supertypes)
+
+            for m in methods:
+                writer.add_method(
+                    class_id,
+                    m["method"],
+                    m["returns"],
+                    m["params"],
+                    m["is_static"],
+                    m["annotation"],
+                    m["snippet"],
+                )
+                writer.add_calls(class_id, m["method"], m["calls"])
+
+            for c in constants:
+                writer.add_constant(class_id, c["name"], c["type"], c["value"], c["snippet"])
+
+        files_processed += 1
+        if files_processed % BATCH_COMMIT_FILES == 0:
+            writer.flush()
+            conn.commit()
+
+        progress.update(task, advance=1)
+
+    writer.flush()
+    return writer.reused_class_ids
+
+
+def run_index(
+    root: Path | None = None,
+    version: str = "release",
+    jobs: int | None = None,
+    rebuild: bool = False,
+) -> tuple[bool, str | tuple[int, int, int]]:
     """
     Walks through workspace/decompiled/<version>, extracts classes, methods and constants with regex,
     and fills prism_api_<version>.db. Returns (True, (num_classes, num_methods, num_constants));
     (False, "no_decompiled") if no code; (False, "db_error") if DB fails.
+    Incremental: only files added, changed (by content hash) or deleted since the last run are
+    re-indexed; rebuild=True drops the tables and indexes everything.
+    jobs: number of extraction processes (default: CPU count; 1 = sequential).
     """
     root = root or config_impl.get_project_root()
     sources_dir = config_impl.get_sources_dir(root, version)
     if not sources_dir.is_dir():
         return (False, "no_decompiled")
-    java_files = list(sources_dir.rglob("*.java"))
+    #_ Sorted so that class/method ids do not depend on filesystem order
+    java_files = sorted(sources_dir.rglob("*.java"))
     if not java_files:
         return (False, "no_decompiled")
+    jobs = max(1, jobs if jobs is not None else (os.cpu_count() or 1))
 
     db_path = config_impl.get_db_path(root, version)
     try:
         with db.connection(db_path) as conn, out.progress() as progress:
-            db.init_schema(conn)
-            db.clear_tables(conn)
-            files_processed = 0
-            
-            task = progress.add_task(f"[green]Indexing {version}", total=len(java_files), filename="")
-
-            for jpath in java_files:
-                try:
-                    content = jpath.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    progress.update(task, advance=1)
-                    continue
-                #_ Relative path to the decompiled directory for storage
-                try:
-                    rel_path = jpath.relative_to(sources_dir)
-                except ValueError:
-                    rel_path = jpath
-                file_path_str = str(rel_path).replace("\\", "/")
-                
-                #_ Extract and insert
-                results = _extract_from_java(content, file_path_str)
-                for pkg, class_name, kind, methods, parent, interfaces, constants in results:
-                    class_id = db.insert_class(conn, pkg, class_name, kind, file_path_str, parent, interfaces)
-                    
-                    #_ Insert class itself into FTS with its kind as snippet
-                    db.insert_fts_row(conn, pkg, class_name, kind, snippet=f"public {kind} {class_name}")
-                    
-                    #_ Insert methods
-                    for m in methods:
-                        db.insert_method(
-                            conn,
-                            class_id,
-                            m["method"],
-                            m["returns"],
-                            m["params"],
-                            m["is_static"],
-                            m["annotation"],
-                        )
-                        db.insert_fts_row(
-                            conn,
-                            pkg,
-                            class_name,
-                            kind,
-                            method_name=m["method"],
-                            returns=m["returns"],
-                            params=m["params"],
-                            snippet=m["snippet"]
-                        )
-                    
-                    #_ Insert constants
-                    for c in constants:
-                        db.insert_constant(
-                            conn,
-                            class_id,
-                            c["name"],
-                            c["type"],
-                            c["value"],
-                        )
-                        db.insert_fts_row(
-                            conn,
-                            pkg,
-                            class_name,
-                            kind,
-                            const_name=c["name"],
-                            const_value=c["value"],
-                            snippet=c["snippet"]
-                        )
-                
-                files_processed += 1
-                if files_processed % BATCH_COMMIT_FILES == 0:
-                    conn.commit()
-                
-                progress.update(task, advance=1)
+            recreated = db.init_schema(conn, rebuild=rebuild)
+            extract_jobs, stale, deleted = _plan_incremental(conn, sources_dir, java_files)
+
+            #_ Old rows go first: a class that moved to another file must not be deleted after its re-insert
+            db.delete_file_rows(conn, deleted, drop_manifest=True)
+            db.delete_file_rows(conn, stale)
+
+            task = progress.add_task(f"[green]Indexing {version}", total=len(extract_jobs), filename="")
+            reused = _write_extracted(conn, extract_jobs, jobs, progress, task)
+            #_ A new file that declares a class of unchanged files (nested type with a repeated simple name):
+            #_ rebuild the class from all its files, in path order like a full index
+            if reused:
+                shared = db.get_shared_class_files(conn, class_ids=sorted(reused))
+                db.delete_file_rows(conn, shared)
+                rejobs = [job for job in (_path_job(sources_dir, path) for path in shared) if job]
+                rejobs.sort(key=lambda job: Path(job[0]))
+                progress.update(task, total=len(extract_jobs) + len(rejobs))
+                _write_extracted(conn, rejobs, jobs, progress, task)
 
+            #_ Invalidates cached query results (application.result_cache) only if rows changed
+            if recreated or extract_jobs or stale or deleted:
+                #_ Supertypes may now resolve to (or lose) classes from other files: recompute the whole closure
+                db.rebuild_type_closure(conn)
+                db.bump_generation(conn)
             conn.commit()
             stats = db.get_stats(conn)
         return (True, stats)
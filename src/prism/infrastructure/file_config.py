@@ -17,5 +17,8 @@ class FileConfigProvider:
     def get_decompiled_dir(self, root: Path | None, version: str) -> Path:
         return config_impl.get_decompiled_dir(root, version)
 
+    def get_sources_dir(self, root: Path | None, version: str) -> Path:
+        return config_impl.get_sources_dir(root, version)
+
     def load_config(self, root: Path | None) -> dict:
         return config_impl.load_config(root)
@@ -52,10 +52,41 @@ def sanitize_fts_query(query: str) -> str:
             
     return " ".join(sanitized_parts)
 
+#_ Sub-words of a Java identifier: acronyms (HTTP in HTTPServer), words, digit runs
+RE_IDENTIFIER_SUBTOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+#_ A bare query term that names an identifier (FTS5 operators are left alone)
+RE_BARE_IDENTIFIER = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+FTS_OPERATORS = {"AND", "OR", "NOT", "NEAR"}
+
+
+def identifier_subtokens(name: str | None) -> str:
+    """Lowercase camel-case/snake_case sub-words of an identifier, space-separated ("onEntitySpawned" -> "on entity spawned")."""
+    if not name:
+        return ""
+    return " ".join(t.lower() for t in RE_IDENTIFIER_SUBTOKEN.findall(name))
+
+
+def expand_identifier_terms(fts_query: str) -> str:
+    """
+    Expands every bare identifier of a sanitized api_fts query so it also matches compound names through
+    the tokens column: Spawn -> (Spawn OR tokens:"spawn"*), PlayerSpawn -> (PlayerSpawn OR tokens:"player spawn"*).
+    The trailing sub-word is a prefix (a term range scan in the FTS index), so spawn also finds onEntitySpawned.
+    Quoted phrases, column filters, wildcards and operators are kept as written.
+    """
+    parts = re.findall(r'(?:"[^"]*"|\S+)', fts_query)
+    expanded = []
+    for part in parts:
+        subtokens = identifier_subtokens(part) if RE_BARE_IDENTIFIER.match(part) and part not in FTS_OPERATORS else ""
+        expanded.append(f'({part} OR tokens:"{subtokens}"*)' if subtokens else part)
+    return " ".join(expanded)
+
+
 def parse_search_dsl(query: str) -> Tuple[str, Dict[str, str]]:
     """
     Parses a search string for DSL tokens like 'cat:Blocks' or 'ext:json'.
-    Returns a tuple of (remaining_query, filters_dict).
+    Returns a tuple of (remaining_query, filters_dict). A repeated key keeps every value, comma-separated
+    ('cat:Item cat:Recipe' -> {"cat": "Item,Recipe"}).
     """
     filters = {}
     remaining_parts = []
@@ -69,12 +100,65 @@ def parse_search_dsl(query: str) -> Tuple[str, Dict[str, str]]:
     for word in words:
         if ':' in word and not any(word.lower().startswith(p) for p in ["http:", "https:"]):
             key, val = word.split(':', 1)
-            filters[key.lower()] = val
+            key = key.lower()
+            filters[key] = f"{filters[key]},{val}" if key in filters else val
         else:
             remaining_parts.append(word)
             
     return " ".join(remaining_parts), filters
 
+#_ Asset search filters: key:value tokens (see parse_search_dsl) -> assets column
+ASSET_FILTER_KEYS = {
+    "cat": "category",
+    "category": "category",
+    "ext": "extension",
+    "extension": "extension",
+    "id": "internal_id",
+}
+#_ Numeric comparison tokens (w>=64, size<100k) -> assets column
+ASSET_NUMERIC_KEYS = {"w": "width", "width": "width", "h": "height", "height": "height", "size": "size"}
+RE_NUMERIC_FILTER = re.compile(r"^([A-Za-z]+)(<=|>=|<|>|=)(\d+(?:\.\d+)?)([kKmM]?[bB]?)$")
+SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 * 1024, "mb": 1024 * 1024}
+
+
+def parse_asset_query(query: str) -> Tuple[str, List[Tuple[str, str, object]]]:
+    """
+    Splits an asset search into free text (for FTS) and column filters, e.g.
+    'stone cat:Block ext:png,jpg w>=64 size<100k' -> ("stone", [("category", "IN", ["Block"]),
+    ("extension", "IN", [".png", ".jpg"]), ("width", ">=", 64), ("size", "<", 102400)]).
+    key:value accepts comma-separated alternatives, as does repeating the key (cat:Item cat:Recipe); sizes
+    accept k/kb/m/mb suffixes. Unknown keys and malformed comparisons stay in the text (comparisons quoted).
+    """
+    text, pairs = parse_search_dsl(query or "")
+    filters: List[Tuple[str, str, object]] = []
+    remaining = []
+    #_ One IN list per column: repeated keys and aliases (cat:, category:) add alternatives
+    alternatives: Dict[str, List[str]] = {}
+    for key, value in pairs.items():
+        column = ASSET_FILTER_KEYS.get(key)
+        values = [v for v in value.split(",") if v]
+        if column is None or not values:
+            remaining.append(f"{key}:{value}")
+            continue
+        if column == "extension":
+            values = [v.lower() if v.startswith(".") else f".{v.lower()}" for v in values]
+        merged = alternatives.setdefault(column, [])
+        merged.extend(v for v in values if v not in merged)
+    filters.extend((column, "IN", values) for column, values in alternatives.items())
+    for word in text.split():
+        m = RE_NUMERIC_FILTER.match(word)
+        column = ASSET_NUMERIC_KEYS.get(m.group(1).lower()) if m else None
+        unit = m.group(4).lower() if m else ""
+        if column is None or (unit and column != "size"):
+            #_ A malformed comparison (w>=64kb, size<abc) is searched as a phrase: bare <, >, = are FTS5 syntax errors
+            if any(c in word for c in "<>="):
+                word = '"' + word.replace('"', "") + '"'
+            remaining.append(word)
+            continue
+        filters.append((column, m.group(2), int(float(m.group(3)) * SIZE_UNITS[unit])))
+    return " ".join(remaining), filters
+
+
 def build_fts_query(user_query: str) -> str:
     """
     High-level entry point to convert user input to optimized FTS5 query.
@@ -2,6 +2,8 @@
 from pathlib import Path
 from typing import List, Optional
 from . import db as _db
+from . import search_utils as _search_utils
+from .assets_indexer import CATEGORY_CLASSIFIER
 from ..ports.assets_repository import AssetsRepository
 from ..domain.asset import Asset
 
@@ -21,12 +23,33 @@ class SqliteAssetsRepository:
                     internal_id=r["internal_id"],
                     width=r["width"],
                     height=r["height"],
-                    metadata=r["metadata"],
                     version=r["version"]
                 )
                 for r in rows
             ]
 
+    def search_assets_faceted(self, db_path: Path, query: str, limit: int = 50) -> dict:
+        """
+        Search with filters (see search_utils.parse_asset_query) run on B-tree indexes, free text on FTS5.
+        cat: accepts a category name or a CATEGORY_MAP folder. Returns {"text", "filters", "results": [Asset],
+        "total", "facets"}.
+        """
+        text, filters = _search_utils.parse_asset_query(query)
+        resolved = []
+        for column, op, value in filters:
+            if column == "category":
+                value = [CATEGORY_CLASSIFIER.resolve(v) or v for v in value]
+            resolved.append((column, op, value))
+        with _db.read_connection(db_path) as conn:
+            found = _db.search_assets_faceted(conn, text, resolved, limit)
+        return {
+            "text": text,
+            "filters": [{"field": c, "op": op, "value": v} for c, op, v in resolved],
+            "results": [Asset(**r) for r in found["results"]],
+            "total": found["total"],
+            "facets": found["facets"],
+        }
+
     def get_asset_by_path(self, db_path: Path, path: str) -> Optional[Asset]:
         """Get a specific asset by its path."""
         with _db.connection(db_path) as conn:
@@ -45,6 +68,51 @@ class SqliteAssetsRepository:
                 internal_id=r["internal_id"],
                 width=r["width"],
                 height=r["height"],
-                metadata=r["metadata"],
+                metadata=_db.decode_asset_metadata(r["metadata"]),
                 version=r["version"]
             )
+
+    def get_asset_references(self, db_path: Path, path: str, reverse: bool = False, depth: int = 1, limit: int = 100) -> Optional[dict]:
+        """
+        Walks the asset reference graph from an asset. Returns {"refs": [...] or None if the index has no
+        reference graph, "unresolved": [...]} or None if the asset is not indexed.
+        """
+        with _db.read_connection(db_path) as conn:
+            row = conn.execute("SELECT id FROM assets WHERE path = ?", (path,)).fetchone()
+            if not row:
+                return None
+            refs = _db.get_asset_refs(conn, row["id"], reverse=reverse, depth=depth, limit=limit)
+            unresolved = [] if reverse or refs is None else _db.get_unresolved_asset_refs(conn, row["id"])
+            return {"refs": refs, "unresolved": unresolved}
+
+    def get_asset_code_links(
+        self, db_path: Path, api_db_path: Optional[Path], category: Optional[str] = None,
+        package: Optional[str] = None, class_name: Optional[str] = None, asset: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Links from asset_code_links; the API DB (if it exists) is ATTACHed so each class comes with its kind
+        and file_path in the same query. asset (path or internal id) selects the category of that asset.
+        Returns {"links": [...], "categories": {category: {"asset_count", "samples"}}} or None if the table is missing.
+        """
+        with _db.read_connection(db_path) as conn:
+            if asset:
+                row = conn.execute(
+                    "SELECT category FROM assets WHERE path = ? OR internal_id = ? LIMIT 1", (asset, asset)
+                ).fetchone()
+                if not row or not row["category"]:
+                    return {"links": [], "categories": {}}
+                category = row["category"]
+            with_api = api_db_path is not None and api_db_path.is_file()
+            if with_api:
+                with _db.attached(conn, api_db_path, "api"):
+                    links = _db.get_asset_code_links(conn, category, package, class_name, with_api=True)
+            else:
+                links = _db.get_asset_code_links(conn, category, package, class_name)
+            if links is None:
+                return None
+            categories = {}
+            for link in links:
+                if link["category"] not in categories:
+                    count, samples = _db.get_category_assets(conn, link["category"])
+                    categories[link["category"]] = {"folder": link["folder"], "asset_count": count, "samples": samples}
+            return {"links": links, "categories": categories}
@@ -7,7 +7,7 @@ from . import db as _db
 
 
 class SqliteIndexRepository:
-    """Implements IndexRepository using the existing db module."""
+    """Implements IndexRepository using the existing db module (pooled read-only connections)."""
 
     def search(
         self,
@@ -20,7 +20,7 @@ class SqliteIndexRepository:
     ) -> list:
         if not query_term or not query_term.strip():
             return []
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             rows = _db.search_fts(
                 conn,
                 query_term.strip(),
@@ -48,13 +48,19 @@ class SqliteIndexRepository:
         ]
 
     def get_class_and_methods(self, db_path: Path, package: str, class_name: str) -> dict | None:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.get_class_and_methods(conn, package.strip(), class_name.strip())
 
+    def get_classes(
+        self, db_path: Path, keys: list[tuple[str, str]], fields: set[str] | None = None
+    ) -> dict[tuple[str, str], dict]:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_classes(conn, keys, fields)
+
     def get_method(
         self, db_path: Path, package: str, class_name: str, method_name: str
     ) -> dict | None:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.get_method(conn, package.strip(), class_name.strip(), method_name.strip())
 
     def list_classes(
@@ -65,26 +71,56 @@ class SqliteIndexRepository:
         limit: int = 100,
         offset: int = 0,
     ) -> list[dict]:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.list_classes(
                 conn, package_prefix, prefix_match=prefix_match, limit=limit, offset=offset
             )
 
+    def get_callers(self, db_path: Path, class_name: str, method_name: str, limit: int = 200) -> list[dict] | None:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_callers(conn, class_name, method_name, limit)
+
+    def get_callees(self, db_path: Path, package: str, class_name: str, method_name: str) -> list[dict] | None:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_callees(conn, package, class_name, method_name)
+
+    def resolve_method_class(
+        self, db_path: Path, class_name: str | None, method_name: str, package_hint: str | None = None
+    ) -> dict | None:
+        with _db.read_connection(db_path) as conn:
+            return _db.resolve_method_class(conn, class_name, method_name, package_hint)
+
+    def get_identifier_postings(self, db_path: Path, name: str) -> list[dict] | None:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_identifier_postings(conn, name)
+
+    def get_generation(self, db_path: Path) -> str | None:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_generation(conn)
+
+    def get_symbol_classes(self, db_path: Path) -> list[dict]:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_symbol_classes(conn)
+
+    def get_symbol_members(self, db_path: Path) -> list[tuple[int, str]]:
+        with _db.read_connection(db_path) as conn:
+            return _db.get_symbol_members(conn)
+
     def get_stats(self, db_path: Path) -> tuple[int, int, int]:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.get_stats(conn)
 
     def list_subpackages(self, db_path: Path, package_prefix: str | None = None) -> list[str]:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.list_subpackages(conn, package_prefix)
 
     def find_implementations(self, db_path: Path, target_name: str, limit: int = 100) -> list[dict]:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.find_implementations(conn, target_name, limit)
 
     def list_events(self, db_path: Path, limit: int = 100) -> dict:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.list_events(conn, limit)
     def find_systems_for_component(self, db_path: Path, component_name: str, limit: int = 100) -> list[dict]:
-        with _db.connection(db_path) as conn:
+        with _db.read_connection(db_path) as conn:
             return _db.find_systems_for_component(conn, component_name, limit)
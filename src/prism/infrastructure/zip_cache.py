@@ -0,0 +1,112 @@
+# Process-wide cache of open ZipFile handles (Assets.zip) for repeated single-entry reads.
+
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+#_ Open archives kept at once (release + prerelease, with room for a replaced file still in use)
+ZIP_CACHE_MAX_HANDLES = 4
+
+#_ ZipInfo.compress_type -> readable name
+COMPRESSION_NAMES = {
+    zipfile.ZIP_STORED: "stored",
+    zipfile.ZIP_DEFLATED: "deflate",
+    zipfile.ZIP_BZIP2: "bzip2",
+    zipfile.ZIP_LZMA: "lzma",
+}
+
+#_ Inflated bytes discarded per step while skipping to an offset (bounds memory for deep offsets)
+SKIP_CHUNK_BYTES = 64 * 1024
+
+
+def _file_identity(zip_path: Path) -> tuple[int, int, int, int] | None:
+    """(st_dev, st_ino, st_size, st_mtime_ns) of the archive; changes when it is replaced or rewritten."""
+    try:
+        st = os.stat(zip_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+_handles: dict[str, tuple[tuple[int, int, int, int], zipfile.ZipFile]] = {}
+_handles_lock = threading.Lock()
+
+
+def get_zip(zip_path: Path) -> zipfile.ZipFile | None:
+    """
+    Returns a shared, read-only ZipFile for zip_path, parsing its central directory only the first time and
+    whenever the file changes on disk (identity/size/mtime). None if the file does not exist or is not a ZIP.
+    Concurrent readers may use the handle: zipfile serializes seeks on the shared file and each opened
+    entry keeps its own position. A stale handle is not closed here (a reader may still hold it); it is
+    released when no longer referenced.
+    """
+    key = str(zip_path)
+    identity = _file_identity(zip_path)
+    if identity is None:
+        return None
+    with _handles_lock:
+        cached = _handles.get(key)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+    try:
+        zf = zipfile.ZipFile(zip_path, 'r')
+    except (OSError, zipfile.BadZipFile):
+        return None
+    with _handles_lock:
+        _handles.pop(key, None)
+        while len(_handles) >= ZIP_CACHE_MAX_HANDLES:
+            _handles.pop(next(iter(_handles)))
+        _handles[key] = (identity, zf)
+    return zf
+
+
+def get_entry(zip_path: Path, entry_name: str) -> tuple[zipfile.ZipFile, zipfile.ZipInfo] | None:
+    """Looks up one entry (dict lookup in the cached central directory). None if the archive or entry is missing."""
+    zf = get_zip(zip_path)
+    if zf is None:
+        return None
+    #_ zipfile.ZipFile.open expects a ZIP-style path (forward slashes)
+    info = zf.NameToInfo.get(entry_name.replace('\\', '/'))
+    if info is None or info.is_dir():
+        return None
+    return (zf, info)
+
+
+def read_entry(zip_path: Path, entry_name: str) -> bytes | None:
+    """Reads one entry: a seek to its local header plus one inflate. None if the archive or entry is missing."""
+    found = get_entry(zip_path, entry_name)
+    if found is None:
+        return None
+    zf, info = found
+    with zf.open(info) as f:
+        return f.read()
+
+
+def read_entry_range(zip_path: Path, entry_name: str, offset: int, length: int) -> tuple[bytes, zipfile.ZipInfo] | None:
+    """
+    Reads length bytes of one entry starting at offset (of the uncompressed content), inflating only up to
+    the end of the window: bytes before offset are streamed and discarded in SKIP_CHUNK_BYTES steps.
+    Returns (data, info) or None if the archive or entry is missing.
+    """
+    found = get_entry(zip_path, entry_name)
+    if found is None:
+        return None
+    zf, info = found
+    offset = max(0, min(offset, info.file_size))
+    with zf.open(info) as f:
+        remaining = offset
+        while remaining > 0:
+            skipped = len(f.read(min(remaining, SKIP_CHUNK_BYTES)))
+            if not skipped:
+                break
+            remaining -= skipped
+        return (f.read(max(0, length)), info)
+
+
+def close_zip_cache() -> None:
+    """Closes every cached handle."""
+    with _handles_lock:
+        for _, zf in _handles.values():
+            zf.close()
+        _handles.clear()
@@ -10,6 +10,21 @@ class AssetsRepository(Protocol):
         """Search assets via FTS5."""
         ...
 
+    def search_assets_faceted(self, db_path: Path, query: str, limit: int = 50) -> dict:
+        """Search with filters (cat:, ext:, id:, w/h/size comparisons) plus category/extension facet counts."""
+        ...
+
     def get_asset_by_path(self, db_path: Path, path: str) -> Optional[Asset]:
         """Get a specific asset by its path."""
         ...
+
+    def get_asset_references(self, db_path: Path, path: str, reverse: bool = False, depth: int = 1, limit: int = 100) -> Optional[dict]:
+        """Assets referenced by an asset (or referencing it when reverse), transitively; None if the asset is not indexed."""
+        ...
+
+    def get_asset_code_links(
+        self, db_path: Path, api_db_path: Optional[Path], category: Optional[str] = None,
+        package: Optional[str] = None, class_name: Optional[str] = None, asset: Optional[str] = None
+    ) -> Optional[dict]:
+        """Asset categories <-> API classes that load them, with asset counts and samples; None if the link table is missing."""
+        ...
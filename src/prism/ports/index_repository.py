@@ -17,6 +17,10 @@ class IndexRepository(Protocol):
         unique_classes: bool = False,
     ) -> list[dict] | list[Any]: ...
     def get_class_and_methods(self, db_path: Path, package: str, class_name: str) -> dict | None: ...
+    #_ Several classes in one round-trip, keyed by (package, class_name); fields projects the entries
+    def get_classes(
+        self, db_path: Path, keys: list[tuple[str, str]], fields: set[str] | None = None
+    ) -> dict[tuple[str, str], dict]: ...
     def get_method(self, db_path: Path, package: str, class_name: str, method_name: str) -> dict | None: ...
     def list_classes(
         self,
@@ -27,3 +31,16 @@ class IndexRepository(Protocol):
         offset: int = 0,
     ) -> list[dict]: ...
     def get_stats(self, db_path: Path) -> tuple[int, int, int]: ...
+    #_ Call graph (None = DB without call_edges)
+    def get_callers(self, db_path: Path, class_name: str, method_name: str, limit: int = 200) -> list[dict] | None: ...
+    def get_callees(self, db_path: Path, package: str, class_name: str, method_name: str) -> list[dict] | None: ...
+    def resolve_method_class(
+        self, db_path: Path, class_name: str | None, method_name: str, package_hint: str | None = None
+    ) -> dict | None: ...
+    #_ [{"file_path", "lines"}] of an identifier (None = DB without identifier index)
+    def get_identifier_postings(self, db_path: Path, name: str) -> list[dict] | None: ...
+    #_ Classes {"id", "package", "class_name", "kind"} and (class_id, member name) for the fuzzy symbol table
+    def get_symbol_classes(self, db_path: Path) -> list[dict]: ...
+    def get_symbol_members(self, db_path: Path) -> list[tuple[int, str]]: ...
+    #_ Token that changes whenever the index is rewritten (None = unknown, do not cache)
+    def get_generation(self, db_path: Path) -> str | None: ...